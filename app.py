@@ -5,7 +5,7 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import os
 from aws_cost_service import AWSCostService
-from utils import format_currency, export_to_csv, get_date_range
+from utils import format_currency, format_cost_columns, export_to_csv, get_date_range
 
 # Page configuration
 st.set_page_config(
@@ -24,6 +24,8 @@ if 'cost_data' not in st.session_state:
     st.session_state.cost_data = None
 if 'service_costs' not in st.session_state:
     st.session_state.service_costs = None
+if 'total_aws_spend' not in st.session_state:
+    st.session_state.total_aws_spend = None
 if 'last_refresh' not in st.session_state:
     st.session_state.last_refresh = None
 
@@ -74,17 +76,16 @@ with config_tabs[0]:
                         selected_start = datetime.combine(start_date_input, datetime.min.time())
                         selected_end = datetime.combine(end_date_input, datetime.min.time())
                         
-                        # Get monthly costs for selected range
-                        st.session_state.cost_data = cost_service.get_monthly_costs(selected_start, selected_end)
-                        
-                        # Get service breakdown for selected range
-                        st.session_state.service_costs = cost_service.get_costs_by_service(selected_start, selected_end)
-                        
-                        # Get daily costs if range is <= 31 days
-                        if (end_date_input - start_date_input).days <= 31:
-                            st.session_state.daily_costs = cost_service.get_daily_costs(selected_start, selected_end)
-                        else:
-                            st.session_state.daily_costs = []
+                        # Get monthly costs, service breakdown and (for ranges <= 31 days) daily costs concurrently
+                        dashboard_costs = cost_service.get_dashboard_costs(
+                            selected_start, selected_end,
+                            include_daily=(end_date_input - start_date_input).days <= 31
+                        )
+                        st.session_state.cost_data = dashboard_costs['monthly_costs']
+                        st.session_state.service_costs = dashboard_costs['service_costs']
+                        # Summed once per load; the service metrics and AI recommendations reuse it
+                        st.session_state.total_aws_spend = sum(s['Amount_Numeric'] for s in dashboard_costs['service_costs'])
+                        st.session_state.daily_costs = dashboard_costs['daily_costs']
                         
                         # Store date range info
                         st.session_state.current_date_range = {
@@ -418,12 +419,12 @@ with st.sidebar:
                 cost_service = AWSCostService()
                 
                 # Get costs for preset range
-                st.session_state.cost_data = cost_service.get_monthly_costs(
-                    st.session_state.preset_start, st.session_state.preset_end
-                )
-                st.session_state.service_costs = cost_service.get_costs_by_service(
+                dashboard_costs = cost_service.get_dashboard_costs(
                     st.session_state.preset_start, st.session_state.preset_end
                 )
+                st.session_state.cost_data = dashboard_costs['monthly_costs']
+                st.session_state.service_costs = dashboard_costs['service_costs']
+                st.session_state.total_aws_spend = sum(s['Amount_Numeric'] for s in dashboard_costs['service_costs'])
                 
                 # Update current range
                 st.session_state.current_date_range = {
@@ -458,6 +459,7 @@ with col1:
         df_monthly = pd.DataFrame(st.session_state.cost_data)
         # Apply format_currency to handle both string and numeric amounts
         df_monthly['Amount'] = df_monthly['Amount'].apply(format_currency)
+        df_monthly = df_monthly.drop('Amount_Numeric', axis=1)
         
         # Display table with sorting
         current_range = st.session_state.get('current_date_range', {})
@@ -472,8 +474,7 @@ with col1:
         )
         
         # Total cost calculation
-        total_cost = sum([float(item['Amount'].replace('$', '').replace(',', '')) 
-                         for item in st.session_state.cost_data])
+        total_cost = sum(item['Amount_Numeric'] for item in st.session_state.cost_data)
         num_months = len(st.session_state.cost_data)
         average_monthly = total_cost / num_months if num_months > 0 else 0
         
@@ -490,8 +491,8 @@ with col1:
         with col_metric3:
             # Calculate trend (current vs previous month)
             if len(st.session_state.cost_data) >= 2:
-                current_month = float(st.session_state.cost_data[-1]['Amount'].replace('$', '').replace(',', ''))
-                previous_month = float(st.session_state.cost_data[-2]['Amount'].replace('$', '').replace(',', ''))
+                current_month = st.session_state.cost_data[-1]['Amount_Numeric']
+                previous_month = st.session_state.cost_data[-2]['Amount_Numeric']
                 trend = ((current_month - previous_month) / previous_month) * 100
                 st.metric("Month-over-Month Change", f"{trend:+.1f}%")
 
@@ -500,8 +501,7 @@ with col2:
     
     if st.session_state.cost_data:
         # Find highest and lowest cost months
-        costs_numeric = [(item['Month'], float(item['Amount'].replace('$', '').replace(',', ''))) 
-                        for item in st.session_state.cost_data]
+        costs_numeric = [(item['Month'], item['Amount_Numeric']) for item in st.session_state.cost_data]
         
         highest_month = max(costs_numeric, key=lambda x: x[1])
         lowest_month = min(costs_numeric, key=lambda x: x[1])
@@ -525,7 +525,6 @@ with tab1:
     if st.session_state.cost_data:
         # Prepare data for line chart
         df_chart = pd.DataFrame(st.session_state.cost_data)
-        df_chart['Amount_Numeric'] = df_chart['Amount'].str.replace('$', '').str.replace(',', '').astype(float)
         
         # Line chart
         fig_line = px.line(
@@ -551,7 +550,6 @@ with tab2:
     if st.session_state.service_costs:
         # Prepare service data for pie chart
         df_services = pd.DataFrame(st.session_state.service_costs)
-        df_services['Amount_Numeric'] = df_services['Amount'].str.replace('$', '').str.replace(',', '').astype(float)
         
         # Filter out very small amounts for better visualization
         df_services_filtered = df_services[df_services['Amount_Numeric'] >= 1.0]
@@ -570,9 +568,8 @@ with tab2:
         
         # Service costs table
         st.subheader("Detailed Service Costs")
-        df_services_display = df_services.copy()
-        df_services_display = df_services_display.sort_values('Amount_Numeric', ascending=False)
-        df_services_display = df_services_display.drop('Amount_Numeric', axis=1)
+        # get_costs_by_service already ranks services by Amount_Numeric (descending)
+        df_services_display = df_services.drop('Amount_Numeric', axis=1)
         
         st.dataframe(
             df_services_display,
@@ -584,7 +581,6 @@ with tab3:
     st.subheader("Monthly Cost Comparison")
     if st.session_state.cost_data:
         df_chart = pd.DataFrame(st.session_state.cost_data)
-        df_chart['Amount_Numeric'] = df_chart['Amount'].str.replace('$', '').str.replace(',', '').astype(float)
         
         # Bar chart for monthly comparison
         fig_bar = px.bar(
@@ -616,7 +612,6 @@ with tab4:
             
             # Calculate month-over-month changes
             df_chart = pd.DataFrame(st.session_state.cost_data)
-            df_chart['Amount_Numeric'] = df_chart['Amount'].str.replace('$', '').str.replace(',', '').astype(float)
             
             if len(df_chart) >= 2:
                 changes = []
@@ -650,11 +645,12 @@ with tab5:
                     with st.spinner(f"Analyzing {selected_service} costs in detail..."):
                         try:
                             cost_service = AWSCostService()
-                            start_date, end_date = get_date_range(6)
+                            months = 6
+                            start_date, end_date = get_date_range(months)
                             
                             # Get detailed service analysis
                             detailed_data = cost_service.get_service_detailed_costs(
-                                selected_service, start_date, end_date
+                                selected_service, start_date, end_date, months=months
                             )
                             
                             # Store in session state
@@ -670,10 +666,12 @@ with tab5:
                         with st.spinner("Generating AI-powered cost optimization recommendations..."):
                             try:
                                 cost_service = AWSCostService()
-                                recommendations = cost_service.generate_ai_recommendations(
+                                # Render tokens as they arrive; write_stream returns the full text
+                                recommendations = st.write_stream(cost_service.stream_ai_recommendations(
                                     st.session_state.detailed_service_data,
-                                    st.session_state.service_costs
-                                )
+                                    st.session_state.service_costs,
+                                    total_aws_spend=st.session_state.total_aws_spend
+                                ))
                                 
                                 st.session_state.ai_recommendations = recommendations
                                 st.success("✅ AI recommendations generated!")
@@ -692,11 +690,8 @@ with tab5:
                 )
                 
                 if selected_service_data:
-                    service_cost = float(selected_service_data['Amount'].replace('$', '').replace(',', ''))
-                    total_aws_cost = sum([
-                        float(s['Amount'].replace('$', '').replace(',', '')) 
-                        for s in st.session_state.service_costs
-                    ])
+                    service_cost = selected_service_data['Amount_Numeric']
+                    total_aws_cost = st.session_state.total_aws_spend
                     percentage = (service_cost / total_aws_cost) * 100
                     
                     col_metric1, col_metric2, col_metric3 = st.columns(3)
@@ -805,7 +800,7 @@ with tab5:
                     
                     # Display main usage breakdown table
                     st.write("**Usage Type Summary:**")
-                    display_df = df_usage.drop('Cost_Numeric', axis=1)
+                    display_df = format_cost_columns(df_usage)
                     st.dataframe(display_df, use_container_width=True, hide_index=True)
                     
                     # Usage type pie chart
@@ -828,13 +823,7 @@ with tab5:
                     df_resources = pd.DataFrame(detailed_data['resource_breakdown'])
                     st.write("**Cost Breakdown by Resource Attributes:**")
                     
-                    # Display available columns, showing Category if present
-                    if 'Category' in df_resources.columns:
-                        display_columns = ['Resource_Type', 'Cost', 'Category']
-                        available_columns = [col for col in display_columns if col in df_resources.columns]
-                        display_resources = df_resources[available_columns]
-                    else:
-                        display_resources = df_resources.drop('Cost_Numeric', axis=1)
+                    display_resources = format_cost_columns(df_resources)
                     
                     st.dataframe(display_resources, use_container_width=True, hide_index=True)
                     
@@ -855,6 +844,11 @@ with tab5:
                         )
                         st.plotly_chart(fig_resources, use_container_width=True)
                 
+                # Actual resource IDs, when resource-level data is enabled for the account
+                if detailed_data.get('resource_id_breakdown'):
+                    st.write("**Top Resources by Cost (last 14 days):**")
+                    st.dataframe(format_cost_columns(pd.DataFrame(detailed_data['resource_id_breakdown'])), use_container_width=True, hide_index=True)
+                
                 # Monthly trend for the service
                 if detailed_data['monthly_data']:
                     st.subheader("📈 Monthly Cost Trend")
@@ -913,7 +907,7 @@ with tab5:
                         
                         # Daily breakdown table
                         st.write("**Daily Breakdown:**")
-                        display_daily = df_daily.drop(['Cost_Numeric', 'Usage_Numeric'], axis=1)
+                        display_daily = format_cost_columns(df_daily)
                         st.dataframe(display_daily, use_container_width=True, hide_index=True)
                     
                     # Operation breakdown
@@ -922,7 +916,7 @@ with tab5:
                         df_operations = pd.DataFrame(usage_details['operation_breakdown'])
                         
                         # Operations table
-                        display_operations = df_operations.drop(['Cost_Numeric', 'Usage_Numeric'], axis=1)
+                        display_operations = format_cost_columns(df_operations)
                         st.dataframe(display_operations, use_container_width=True, hide_index=True)
                         
                         # Operations pie chart
@@ -944,7 +938,7 @@ with tab5:
                         df_regions = pd.DataFrame(usage_details['region_breakdown'])
                         
                         # Regions table
-                        display_regions = df_regions.drop('Cost_Numeric', axis=1)
+                        display_regions = format_cost_columns(df_regions)
                         st.dataframe(display_regions, use_container_width=True, hide_index=True)
                         
                         # Regions bar chart
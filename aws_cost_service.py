@@ -1,21 +1,508 @@
+import asyncio
 import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 import os
 import numpy as np
+import pandas as pd
 import json
 import re
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+import heapq
+import operator
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import List, Dict, Any, AsyncIterator, Callable, Iterator, NamedTuple, Optional, Tuple, Union
 import logging
+import threading
+import sqlite3
+import hashlib
+import time
+from collections import Counter, OrderedDict
+from contextlib import closing
+from concurrent.futures import Future, ThreadPoolExecutor
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import orjson
+except ImportError:  # orjson is optional; the standard library json module is used without it
+    orjson = None
+
+# Configure root logging only when AWS_COST_LOG_LEVEL asks for it, so importing this module leaves the
+# host application's logging alone
+if os.getenv("AWS_COST_LOG_LEVEL"):
+    logging.basicConfig(level=os.getenv("AWS_COST_LOG_LEVEL").upper())
 logger = logging.getLogger(__name__)
 
+# Bound getters for the Metrics -> BlendedCost/UsageQuantity -> Amount lookups in group parsing loops
+_get_blended = operator.itemgetter('BlendedCost')
+_get_usage = operator.itemgetter('UsageQuantity')
+_get_amount = operator.itemgetter('Amount')
+# Ranking key for breakdown records
+_get_cost = operator.itemgetter('Cost_Numeric')
+
+# Bound formatters for dollar amounts and usage quantities in record builders, so each format spec is parsed once
+_format_usd = "${:,.2f}".format
+_format_quantity = "{:,.2f}".format
+
+# Shared pool for independent, network-bound AWS API calls. Only work that calls AWS directly is
+# submitted here (never work that itself waits on this pool), so tasks cannot deadlock waiting on each other.
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='aws-cost')
+
+# Connection pool sized for the concurrent API calls above; adaptive retries back off (with jitter
+# and client-side rate limiting) when Cost Explorer throttles, and bounded timeouts keep a stuck
+# connection from holding a pool worker. TCP keepalive keeps idle pooled connections open between
+# user actions, so later calls reuse them instead of repeating the TLS handshake.
+_CLIENT_CONFIG = Config(
+    max_pool_connections=max(20, (os.cpu_count() or 1) * 5),
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    connect_timeout=5,
+    read_timeout=30,
+    tcp_keepalive=True
+)
+
+# boto3 clients are thread-safe and shared by every AWSCostService instance, keyed by
+# (session, service, region). Sessions are not thread-safe, so client creation is serialized.
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+# Cost Explorer requests currently being fetched, keyed by response cache key. A caller that misses
+# the cache while the same request is already in flight waits for that result instead of paying
+# for (and being throttled on) a duplicate call.
+_IN_FLIGHT = {}
+_IN_FLIGHT_LOCK = threading.Lock()
+
+# Default location of the on-disk Cost Explorer response cache (override with AWS_COST_CACHE_PATH)
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "aws-cost-calculator", "cost_explorer.sqlite3")
+
+# Cost Explorer Amount strings that are exactly zero, skipped before float parsing
+_ZERO_AMOUNTS = frozenset({'0', '0.0', '0.00'})
+
+# Longest window get_daily_costs returns at daily resolution with resolution='auto'; longer ranges are bucketed weekly
+DAILY_RESOLUTION_MAX_DAYS = 62
+# Values get_daily_costs accepts for its resolution argument
+DAILY_COST_RESOLUTIONS = ('daily', 'weekly', 'monthly', 'auto')
+
+# Cost Explorer only keeps resource-level (RESOURCE_ID) data for the trailing 14 days, and only when
+# the account has opted in. Namespaces whose account has not are remembered so the request is not repeated.
+RESOURCE_DATA_DAYS = 14
+_RESOURCE_DATA_UNAVAILABLE = set()
+
+# Resource inventories listed by get_actual_resource_names, keyed by (credentials namespace, service) and
+# stored as (timestamp, resources). Drill-downs into several usage types of one service reuse the listing.
+RESOURCE_NAMES_TTL_SECONDS = 5 * 60
+_RESOURCE_NAMES_CACHE = {}
+
+# get_actual_resource_names dispatch: the first token found in the service name selects the
+# AWSCostService method that lists its resources; anything else goes through the tagging API
+_RESOURCE_LISTERS = (
+    ('Amazon Q', '_list_q_business_resources'),
+    ('EC2', '_list_ec2_resources'),
+    ('Elastic Compute', '_list_ec2_resources'),
+    ('RDS', '_list_rds_resources'),
+    ('Relational Database', '_list_rds_resources'),
+    ('S3', '_list_s3_resources'),
+    ('Simple Storage', '_list_s3_resources'),
+    ('Lambda', '_list_lambda_resources'),
+)
+
+# Services whose costs carry an INSTANCE_TYPE / PLATFORM dimension; for everything else Cost Explorer
+# only returns the NoInstanceType / NoPlatform placeholder, so those breakdowns are not requested
+INSTANCE_TYPE_SERVICES = frozenset({
+    'Amazon Elastic Compute Cloud - Compute',
+    'Amazon Relational Database Service',
+    'Amazon ElastiCache',
+    'Amazon OpenSearch Service',
+    'Amazon Redshift',
+    'Amazon Elastic MapReduce',
+    'Amazon SageMaker',
+    'Amazon Neptune',
+    'Amazon DocumentDB (with MongoDB compatibility)',
+    'Amazon MemoryDB'
+})
+PLATFORM_SERVICES = frozenset({
+    'Amazon Elastic Compute Cloud - Compute'
+})
+# Regional or global services that are not billed per Availability Zone and only report NoAZ
+NO_AZ_SERVICES = frozenset({
+    'Amazon Simple Storage Service',
+    'AWS Lambda',
+    'Amazon CloudFront',
+    'Amazon Route 53'
+})
+
+# Resource attribute dimensions of the service detail view: display name, the placeholder Cost Explorer
+# reports when the dimension does not apply, the services that populate it (None for all) and the
+# services that never do
+_DETAIL_DIMENSIONS = {
+    'INSTANCE_TYPE': ('Instance Type', 'NoInstanceType', INSTANCE_TYPE_SERVICES, frozenset()),
+    'AZ': ('Availability Zone', 'NoAZ', None, NO_AZ_SERVICES),
+    'PLATFORM': ('Platform', 'NoPlatform', PLATFORM_SERVICES, frozenset())
+}
+
+# Placeholder Cost Explorer reports per enhanced breakdown dimension when the dimension does not apply
+_DIMENSION_PLACEHOLDERS = {
+    **{dimension_key: placeholder for dimension_key, (_, placeholder, _, _) in _DETAIL_DIMENSIONS.items()},
+    'OPERATION': 'NoOperation',
+    'REGION': 'NoRegion',
+    'LINKED_ACCOUNT': 'NoLinkedAccount'
+}
+
+def _detail_dimensions(service_name: str) -> List[str]:
+    """Return the _DETAIL_DIMENSIONS keys a service reports as more than the placeholder value"""
+    return [
+        dimension_key
+        for dimension_key, (_, _, reporting_services, non_reporting_services) in _DETAIL_DIMENSIONS.items()
+        if (reporting_services is None or service_name in reporting_services) and service_name not in non_reporting_services
+    ]
+
+@lru_cache(maxsize=None)
+def _resource_lister(service_name: str) -> str:
+    """Return the name of the AWSCostService method that lists a service's resources"""
+    return next((lister for token, lister in _RESOURCE_LISTERS if token in service_name), '_list_tagged_resources')
+
+# Default number of months a service detail request covers; longer ranges are clipped to the latest ones
+MAX_MONTHS_DEFAULT = 3
+
+# English month names for labels, indexed by the zero-based month of a YYYY-MM-DD string
+_MONTH_NAMES = (
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+)
+
+def _clip_range(start_date: datetime, end_date: datetime, max_months: int) -> datetime:
+    """
+    Clip a start date so a MONTHLY request ending at end_date spans at most max_months months
+    
+    Args:
+        start_date: Requested start date
+        end_date: Exclusive end date of the request
+        max_months: Maximum number of monthly buckets to request
+        
+    Returns:
+        The later of start_date and the first day of the earliest month to keep
+    """
+    # A mid-month end date already contributes a partial bucket for its own month
+    months_back = max_months if end_date.day == 1 else max_months - 1
+    year, month = divmod(end_date.year * 12 + end_date.month - 1 - months_back, 12)
+    earliest = end_date.replace(year=year, month=month + 1, day=1)
+    return max(start_date, earliest)
+
+@lru_cache(maxsize=64)
+def _month_label(start: str) -> str:
+    """Convert a Cost Explorer period start (YYYY-MM-DD) to a 'Month YYYY' label"""
+    return f"{_MONTH_NAMES[int(start[5:7]) - 1]} {start[:4]}"
+
+@lru_cache(maxsize=64)
+def _month_bounds(month: str) -> Tuple[datetime, datetime]:
+    """Convert a 'YYYY-MM' month to its (first day, first day of next month) datetimes"""
+    year, month_number = int(month[:4]), int(month[5:7])
+    # December rolls over to January of the next year without a branch
+    return datetime(year, month_number, 1), datetime(year + month_number // 12, month_number % 12 + 1, 1)
+
+def _usage_type_filter(service_name: str, usage_type: str) -> Dict[str, Any]:
+    """Build the Cost Explorer filter for one usage type of a service, shared by a method's requests"""
+    return {
+        'And': [
+            {
+                'Dimensions': {
+                    'Key': 'SERVICE',
+                    'Values': [service_name]
+                }
+            },
+            {
+                'Dimensions': {
+                    'Key': 'USAGE_TYPE',
+                    'Values': [usage_type]
+                }
+            }
+        ]
+    }
+
+@lru_cache(maxsize=8)
+def _get_session(aws_access_key_id: str, aws_secret_access_key: str, region_name: str) -> boto3.Session:
+    """Return the process-wide boto3 session for a set of credentials"""
+    return boto3.Session(
+        aws_access_key_id=aws_access_key_id,
+        aws_secret_access_key=aws_secret_access_key,
+        region_name=region_name
+    )
+
+def _groups_frame(response: Dict[str, Any], group_keys: List[str], service: str = None, include_usage: bool = True) -> pd.DataFrame:
+    """
+    Flatten a grouped MONTHLY get_cost_and_usage response into a DataFrame
+    
+    Args:
+        response: Cost Explorer response
+        group_keys: GroupBy dimension keys of the request, in order
+        service: Service the request was filtered to, when SERVICE is not one of the group keys
+        include_usage: Whether the request asked for UsageQuantity as well as BlendedCost
+        
+    Returns:
+        DataFrame with Month, SERVICE, one column per group key, Cost_Numeric and (with include_usage) Usage_Numeric
+    """
+    # Each period's month label is resolved once, not once per group
+    if include_usage:
+        rows = [
+            (
+                month,
+                *group['Keys'],
+                float(_get_amount(_get_blended(group['Metrics']))),
+                float(_get_amount(_get_usage(group['Metrics'])))
+            )
+            for result in response['ResultsByTime']
+            for month in (_month_label(result['TimePeriod']['Start']),)
+            for group in result['Groups']
+            if _get_amount(_get_blended(group['Metrics'])) not in _ZERO_AMOUNTS
+        ]
+    else:
+        rows = [
+            (month, *group['Keys'], float(amount))
+            for result in response['ResultsByTime']
+            for month in (_month_label(result['TimePeriod']['Start']),)
+            for group in result['Groups']
+            if (amount := _get_amount(_get_blended(group['Metrics']))) not in _ZERO_AMOUNTS
+        ]
+    df = pd.DataFrame(rows, columns=['Month', *group_keys, 'Cost_Numeric', *(['Usage_Numeric'] if include_usage else [])])
+    if 'SERVICE' not in df.columns:
+        df['SERVICE'] = service
+    return df
+
+# Fields every enhanced breakdown entry shares; resource tags are not looked up for dimension values
+_ENHANCED_RESOURCE_DEFAULTS = {
+    'Resource_State': 'Active',
+    'Owner': 'Unknown',
+    'Environment': 'Unknown',
+    'Project': 'Unknown'
+}
+
+def _service_amounts_frame(response: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Flatten a MONTHLY get_cost_and_usage response grouped by SERVICE into a DataFrame
+    
+    Args:
+        response: Cost Explorer response
+        
+    Returns:
+        DataFrame with Period (categorical over every returned period, sorted), Service and Amount_Numeric
+    """
+    rows = [
+        (
+            result['TimePeriod']['Start'],
+            group['Keys'][0] if group['Keys'] else 'Unknown Service',
+            float(_get_amount(_get_blended(group['Metrics'])))
+        )
+        for result in response['ResultsByTime']
+        for group in result['Groups']
+    ]
+    df = pd.DataFrame(rows, columns=['Period', 'Service', 'Amount_Numeric']).astype({'Amount_Numeric': 'float64'})
+    periods = sorted({result['TimePeriod']['Start'] for result in response['ResultsByTime']})
+    df['Period'] = pd.Categorical(df['Period'], categories=periods, ordered=True)
+    return df
+
+class _EnhancedResource(NamedTuple):
+    """Compact enhanced breakdown entry; only the kept top entries are expanded into display dicts"""
+    Resource_ID: str
+    Resource_Name: str
+    Resource_Type: str
+    Region: str
+    Cost_Numeric: float
+    Usage_Numeric: float
+    Category: str
+
+def _json_dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize obj to a JSON string, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    if indent:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(',', ':'))
+
+def _rounded_amounts(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Round float fields to cents, for compact prompt context"""
+    return {key: round(value, 2) if isinstance(value, float) else value for key, value in record.items()}
+
+def _json_dumpb(obj: Any, default=None, sort_keys: bool = False) -> bytes:
+    """Serialize obj to compact JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, separators=(',', ':'), default=default, sort_keys=sort_keys).encode()
+
+def _json_loads(data: Any) -> Any:
+    """Parse a JSON document, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+async def _run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Await a blocking AWSCostService call from an event loop
+    
+    The call may wait on its own requests in _EXECUTOR, so it runs on the loop's default executor
+    rather than in _EXECUTOR itself.
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+class _CostExplorerCache:
+    """
+    SQLite-backed on-disk cache for Cost Explorer responses and generated recommendations
+    
+    The in-memory layer hands the same parsed response to every caller, so cached responses are
+    read-only: callers build their own records from them and never modify ResultsByTime, Groups
+    or any other part of a response they got from get or stored with put.
+    """
+    
+    # Periods that ended before the current month, and that Cost Explorer no longer marks Estimated,
+    # are settled and change rarely
+    HISTORICAL_TTL_SECONDS = 30 * 24 * 60 * 60
+    CURRENT_TTL_SECONDS = 60 * 60
+    # Completed Bedrock recommendations for an identical cost context
+    RECOMMENDATIONS_TTL_SECONDS = 24 * 60 * 60
+    # Parsed responses kept in memory, so repeated reads on every UI rerun skip SQLite and JSON parsing
+    MEMORY_MAX_ENTRIES = 512
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._memory = OrderedDict()
+        self._memory_lock = threading.Lock()
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with closing(sqlite3.connect(self.path)) as conn, conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, ts REAL, blob TEXT)")
+                # Nothing outlives the longest TTL, so drop those rows to keep the file bounded
+                conn.execute("DELETE FROM responses WHERE ts < ?", (time.time() - self.HISTORICAL_TTL_SECONDS,))
+        except Exception as e:
+            logger.warning("Cost Explorer cache disabled, could not open %s: %s", path, e)
+            self.path = None
+    
+    @staticmethod
+    def make_key(namespace: str, method: str, params: Dict[str, Any]) -> str:
+        """Build a stable cache key from the caller namespace, API method and request parameters"""
+        payload = _json_dumpb({'namespace': namespace, 'method': method, 'params': params}, default=str, sort_keys=True)
+        return hashlib.sha1(payload).hexdigest()
+    
+    def ttl_for(self, params: Dict[str, Any], response: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Return the TTL for a request based on whether its period has closed
+        
+        Cost Explorer keeps revising the previous month for some days after it closes and marks those
+        periods Estimated, so a response with any Estimated period gets the short TTL as well.
+        """
+        end = params.get('TimePeriod', {}).get('End', '')
+        current_month_start = date.today().replace(day=1).isoformat()
+        if not end or end > current_month_start:
+            return self.CURRENT_TTL_SECONDS
+        if response is not None and any(result.get('Estimated') for result in response.get('ResultsByTime', ())):
+            return self.CURRENT_TTL_SECONDS
+        return self.HISTORICAL_TTL_SECONDS
+    
+    def get(self, key: str, ttl: Union[int, Callable[[Any], int]]):
+        """
+        Return the cached response for key if it is younger than its TTL, else None; the response is shared and must not be modified
+        
+        ttl is a number of seconds, or a function of the cached response that returns one.
+        """
+        ttl_of = ttl if callable(ttl) else lambda response: ttl
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry and time.time() - entry[0] < ttl_of(entry[1]):
+                self._memory.move_to_end(key)
+                return entry[1]
+        if not self.path:
+            return None
+        try:
+            with closing(sqlite3.connect(self.path)) as conn:
+                row = conn.execute("SELECT ts, blob FROM responses WHERE key = ?", (key,)).fetchone()
+            if row:
+                response = _json_loads(row[1])
+                if time.time() - row[0] < ttl_of(response):
+                    self._remember(key, row[0], response)
+                    return response
+        except Exception as e:
+            logger.debug("Cost Explorer cache read failed: %s", e)
+        return None
+    
+    def _remember(self, key: str, ts: float, response: Any) -> None:
+        """Keep a parsed response in the in-memory layer, evicting the least recently used entries"""
+        with self._memory_lock:
+            self._memory[key] = (ts, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.MEMORY_MAX_ENTRIES:
+                self._memory.popitem(last=False)
+    
+    def put(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response under key; the caller must not modify it afterwards, since later reads share it"""
+        self._remember(key, time.time(), response)
+        if not self.path:
+            return
+        try:
+            blob = _json_dumpb(response, default=str)
+            with closing(sqlite3.connect(self.path)) as conn, conn:
+                conn.execute("INSERT OR REPLACE INTO responses (key, ts, blob) VALUES (?, ?, ?)", (key, time.time(), blob))
+        except Exception as e:
+            logger.debug("Cost Explorer cache write failed: %s", e)
+
+@lru_cache(maxsize=None)
+def _get_cache(path: str) -> _CostExplorerCache:
+    """
+    Return the process-wide cache for path, so the schema check and pruning run once per file
+    
+    No lock is taken here. Two threads that miss at once may each build an instance. Both use the
+    same file and the schema check is idempotent, so the duplicate is harmless.
+    """
+    return _CostExplorerCache(path)
+
 class AWSCostService:
     """Service class for interacting with AWS Cost Explorer API"""
     
+    # Static FinOps instructions, sent as the system prompt so models that support Converse prompt
+    # caching can reuse them across services; only the per-service context below changes per call
+    _SYSTEM_PROMPT = """
+You are an AWS FinOps expert analyzing cost data. Based on the AWS service cost breakdown you are given, provide specific, actionable cost optimization recommendations.
+
+Please provide:
+1. **Immediate Cost Optimization Opportunities** (3-5 specific actions)
+2. **Resource Right-Sizing Recommendations** (if applicable)
+3. **Architecture Optimization Suggestions**
+4. **Potential Monthly Savings Estimate**
+5. **Implementation Priority** (High/Medium/Low for each recommendation)
+
+Keep recommendations practical, specific to the usage patterns shown, and include estimated savings percentages where possible.
+"""
+    
+    # Per-service Bedrock prompt for cost optimization recommendations, filled in with str.format_map
+    _PROMPT_TEMPLATE = """
+Service Analysis:
+- Service: {service_name}
+- Total Cost (6 months): ${total_cost:,.2f}
+- Percentage of total AWS spend: {pct:.1f}%
+
+Usage Breakdown (Top cost drivers):
+{usage_breakdown_json}
+
+Resource Breakdown (if available):
+{resource_breakdown_json}
+
+Monthly Trends:
+{monthly_trends_json}
+"""
+    
+    _BEDROCK_MODEL_ID = os.getenv("AWS_BEDROCK_MODEL_ID", "anthropic.claude-3-sonnet-20240229-v1:0")
+    # Model families that accept Converse cache points (Claude 3 Sonnet does not)
+    _PROMPT_CACHE_MODELS = ('claude-3-5-haiku', 'claude-3-7-sonnet', 'claude-sonnet-4', 'claude-opus-4')
+    # Converse system blocks, built once: the static instructions, plus a cache point where the model supports one
+    _SYSTEM_BLOCKS = [{'text': _SYSTEM_PROMPT}] + (
+        [{'cachePoint': {'type': 'default'}}] if any(map(_BEDROCK_MODEL_ID.__contains__, _PROMPT_CACHE_MODELS)) else []
+    )
+    
+    # Wrapping for the batched prompt; only the rendered per-service contexts between them change per call
+    _BATCH_PROMPT_HEAD = "Analyze each of the following services separately.\n"
+    _BATCH_PROMPT_SEPARATOR = "\n---\n"
+    _BATCH_PROMPT_TAIL = (
+        '\nRespond with only a JSON object of the form {"recommendations": {"<service name>": "<markdown recommendations>"}}, '
+        "with one entry per service, keyed by the exact service name shown above."
+    )
+    
     def __init__(self):
-        """Initialize AWS Cost Explorer client"""
+        """Initialize the AWS session used for Cost Explorer and resource clients"""
         try:
             # Get AWS credentials from environment variables
             aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
@@ -25,27 +512,207 @@ class AWSCostService:
             if not aws_access_key_id or not aws_secret_access_key:
                 raise ValueError("AWS credentials not found in environment variables")
             
-            # Initialize boto3 session and Cost Explorer client
-            session = boto3.Session(
-                aws_access_key_id=aws_access_key_id,
-                aws_secret_access_key=aws_secret_access_key,
-                region_name=aws_region
-            )
+            # Reuse the process-wide session for these credentials; service clients are created on first use
+            self._session = _get_session(aws_access_key_id, aws_secret_access_key, aws_region)
+            self._aws_region = aws_region
             
-            self.cost_explorer = session.client('ce', region_name='us-east-1')  # Cost Explorer is only available in us-east-1
-            self.bedrock = session.client('bedrock-runtime', region_name=aws_region)
-            self.ec2 = session.client('ec2', region_name=aws_region)
-            self.rds = session.client('rds', region_name=aws_region)
-            self.s3 = session.client('s3', region_name=aws_region)
-            self.lambda_client = session.client('lambda', region_name=aws_region)
-            self.resource_groups = session.client('resourcegroupstaggingapi', region_name=aws_region)
-            self.ses_client = session.client('ses', region_name=aws_region)  # For budget notifications
-            logger.info("AWS Cost Explorer, Bedrock, and resource clients initialized successfully")
+            # On-disk Cost Explorer response cache, partitioned per access key
+            self._cache = _get_cache(os.getenv("AWS_COST_CACHE_PATH", DEFAULT_CACHE_PATH))
+            self._cache_namespace = hashlib.sha1(aws_access_key_id.encode()).hexdigest()
+            logger.info("AWS session initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize AWS Cost Explorer client: {str(e)}")
+            logger.error("Failed to initialize AWS Cost Explorer client: %s", e)
             raise
     
+    def _get_client(self, service_name: str, region_name: str):
+        """
+        Return the shared boto3 client for service_name, creating it on first use
+        
+        Existing clients are read from _CLIENTS without taking a lock. _CLIENTS_LOCK is only taken
+        to create a client, because sessions are not thread-safe.
+        """
+        key = (self._session, service_name, region_name)
+        client = _CLIENTS.get(key)
+        if client is not None:
+            return client
+        with _CLIENTS_LOCK:
+            if key not in _CLIENTS:
+                _CLIENTS[key] = self._session.client(service_name, region_name=region_name, config=_CLIENT_CONFIG)
+            return _CLIENTS[key]
+    
+    @property
+    def cost_explorer(self):
+        """Cost Explorer client (Cost Explorer is only available in us-east-1)"""
+        return self._get_client('ce', 'us-east-1')
+    
+    @property
+    def bedrock(self):
+        """Bedrock runtime client"""
+        return self._get_client('bedrock-runtime', self._aws_region)
+    
+    @property
+    def ec2(self):
+        """EC2 client"""
+        return self._get_client('ec2', self._aws_region)
+    
+    @property
+    def rds(self):
+        """RDS client"""
+        return self._get_client('rds', self._aws_region)
+    
+    @property
+    def s3(self):
+        """S3 client"""
+        return self._get_client('s3', self._aws_region)
+    
+    @property
+    def lambda_client(self):
+        """Lambda client"""
+        return self._get_client('lambda', self._aws_region)
+    
+    @property
+    def resource_groups(self):
+        """Resource Groups Tagging API client"""
+        return self._get_client('resourcegroupstaggingapi', self._aws_region)
+    
+    @property
+    def ses_client(self):
+        """SES client, used for budget notifications"""
+        return self._get_client('ses', self._aws_region)
+    
+    def _get_cost_and_usage(self, operation: str = 'get_cost_and_usage', **params) -> Dict[str, Any]:
+        """
+        Call Cost Explorer get_cost_and_usage (or get_cost_and_usage_with_resources) through the on-disk response cache
+        
+        Args:
+            operation: Cost Explorer operation to call
+            **params: Keyword arguments for the operation
+            
+        Returns:
+            Raw Cost Explorer response, shared with the cache and other callers, so it must not be modified
+        """
+        key = self._cache.make_key(self._cache_namespace, operation, params)
+        ttl = lambda cached: self._cache.ttl_for(params, cached)
+        response = self._cache.get(key, ttl)
+        if response is not None:
+            return response
+        
+        # Coalesce identical concurrent requests onto the first caller's fetch. The fetch runs on the
+        # first caller's own thread, so a waiter never depends on queued work.
+        with _IN_FLIGHT_LOCK:
+            in_flight = _IN_FLIGHT.get(key)
+            if in_flight is None:
+                # A fetch that finished after the check above has already cached its response
+                response = self._cache.get(key, ttl)
+                if response is not None:
+                    return response
+                _IN_FLIGHT[key] = future = Future()
+        if in_flight is not None:
+            return in_flight.result()
+        
+        try:
+            response = self._get_all_cost_and_usage_pages(operation, **params)
+            self._cache.put(key, response)
+            future.set_result(response)
+            return response
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _IN_FLIGHT_LOCK:
+                del _IN_FLIGHT[key]
+    
+    def _iter_cost_and_usage_pages(self, operation: str, **params) -> Iterator[Dict[str, Any]]:
+        """
+        Yield every page of one Cost Explorer request
+        
+        Uses the botocore paginator where the installed botocore defines one for this operation,
+        and otherwise follows NextPageToken by hand.
+        
+        Args:
+            operation: Cost Explorer operation to call
+            **params: Keyword arguments for the operation
+            
+        Yields:
+            Raw Cost Explorer response pages
+        """
+        if self.cost_explorer.can_paginate(operation):
+            yield from self.cost_explorer.get_paginator(operation).paginate(**params)
+            return
+        
+        call = getattr(self.cost_explorer, operation)
+        page = call(**params)
+        yield page
+        while page.get('NextPageToken'):
+            page = call(NextPageToken=page['NextPageToken'], **params)
+            yield page
+    
+    def _get_all_cost_and_usage_pages(self, operation: str, **params) -> Dict[str, Any]:
+        """
+        Read every page of a Cost Explorer request into a single response
+        
+        Grouped results for one time period can be split across pages, so groups from later
+        pages are merged into the matching period. Pages are materialized here, inside the
+        calling worker, so parallel callers never share a page iterator.
+        
+        Args:
+            operation: Cost Explorer operation to call
+            **params: Keyword arguments for the operation
+            
+        Returns:
+            First response with ResultsByTime covering all pages
+        """
+        pages = self._iter_cost_and_usage_pages(operation, **params)
+        response = next(pages)
+        results = response['ResultsByTime']
+        results_by_start = {result['TimePeriod']['Start']: result for result in results}
+        
+        for page in pages:
+            for result in page['ResultsByTime']:
+                existing = results_by_start.get(result['TimePeriod']['Start'])
+                if existing is None:
+                    results.append(result)
+                    results_by_start[result['TimePeriod']['Start']] = result
+                else:
+                    existing.setdefault('Groups', []).extend(result.get('Groups', []))
+            if page.get('DimensionValueAttributes'):
+                response.setdefault('DimensionValueAttributes', []).extend(page['DimensionValueAttributes'])
+        
+        response.pop('NextPageToken', None)
+        return response
+    
+    def _get_service_grouped(self, start: str, end: str) -> pd.DataFrame:
+        """
+        Get MONTHLY BlendedCost grouped by SERVICE
+        
+        get_monthly_costs and get_costs_by_service issue this identical request and only differ
+        in how they aggregate it. _get_cost_and_usage coalesces their concurrent calls and caches
+        the response, so one API call serves both.
+        
+        Args:
+            start: Start date string (YYYY-MM-DD)
+            end: End date string (YYYY-MM-DD)
+            
+        Returns:
+            DataFrame with Period, Service and Amount_Numeric columns, one row per group
+        """
+        response = self._get_cost_and_usage(
+            TimePeriod={
+                'Start': start,
+                'End': end
+            },
+            Granularity='MONTHLY',
+            Metrics=['BlendedCost'],
+            GroupBy=[
+                {
+                    'Type': 'DIMENSION',
+                    'Key': 'SERVICE'
+                }
+            ]
+        )
+        return _service_amounts_frame(response)
+    
     def get_monthly_costs(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
         """
         Get monthly cost data for the specified date range
@@ -58,50 +725,28 @@ class AWSCostService:
             List of dictionaries containing monthly cost data
         """
         try:
-            logger.info(f"Fetching monthly costs from {start_date.date()} to {end_date.date()}")
-            
-            response = self.cost_explorer.get_cost_and_usage(
-                TimePeriod={
-                    'Start': start_date.strftime('%Y-%m-%d'),
-                    'End': end_date.strftime('%Y-%m-%d')
-                },
-                Granularity='MONTHLY',
-                Metrics=['BlendedCost'],
-                GroupBy=[
-                    {
-                        'Type': 'DIMENSION',
-                        'Key': 'SERVICE'
-                    }
-                ]
-            )
-            
-            monthly_costs = []
-            
-            # Process the response to extract monthly totals
-            for result in response['ResultsByTime']:
-                start_period = datetime.strptime(result['TimePeriod']['Start'], '%Y-%m-%d')
-                month_name = start_period.strftime('%B %Y')
-                
-                # Calculate total cost for the month
-                total_cost = 0.0
-                for group in result['Groups']:
-                    amount = float(group['Metrics']['BlendedCost']['Amount'])
-                    total_cost += amount
-                
-                monthly_costs.append({
-                    'Month': month_name,
-                    'Amount': f"${total_cost:,.2f}",
-                    'Period': result['TimePeriod']['Start']
-                })
-            
-            # Sort by period to ensure chronological order
-            monthly_costs.sort(key=lambda x: x['Period'])
+            logger.info("Fetching monthly costs from %s to %s", start_date.date(), end_date.date())
+            
+            service_amounts = self._get_service_grouped(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+            
+            # Monthly totals from the per-service groups; Period is categorical over every returned
+            # month in chronological order, so months without groups still total 0
+            monthly_totals = service_amounts.groupby('Period', observed=False)['Amount_Numeric'].sum()
+            monthly_costs = [
+                {
+                    'Month': _month_label(period),
+                    'Amount': _format_usd(total_cost),
+                    'Amount_Numeric': float(total_cost),
+                    'Period': period
+                }
+                for period, total_cost in monthly_totals.items()
+            ]
             
-            logger.info(f"Successfully retrieved {len(monthly_costs)} months of cost data")
+            logger.info("Successfully retrieved %s months of cost data", len(monthly_costs))
             return monthly_costs
             
         except Exception as e:
-            logger.error(f"Error fetching monthly costs: {str(e)}")
+            logger.error("Error fetching monthly costs: %s", e)
             raise Exception(f"Failed to fetch monthly cost data: {str(e)}")
     
     def get_costs_by_service(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
@@ -116,94 +761,93 @@ class AWSCostService:
             List of dictionaries containing service cost data
         """
         try:
-            logger.info(f"Fetching service costs from {start_date.date()} to {end_date.date()}")
+            logger.info("Fetching service costs from %s to %s", start_date.date(), end_date.date())
             
-            response = self.cost_explorer.get_cost_and_usage(
-                TimePeriod={
-                    'Start': start_date.strftime('%Y-%m-%d'),
-                    'End': end_date.strftime('%Y-%m-%d')
-                },
-                Granularity='MONTHLY',
-                Metrics=['BlendedCost'],
-                GroupBy=[
-                    {
-                        'Type': 'DIMENSION',
-                        'Key': 'SERVICE'
-                    }
-                ]
-            )
+            service_amounts = self._get_service_grouped(start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
             
-            service_costs = {}
+            # Aggregate the flattened (service, amount) groups across months in pandas
+            service_costs = service_amounts.groupby('Service', sort=False)['Amount_Numeric'].sum()
             
-            # Aggregate costs by service across all months
-            for result in response['ResultsByTime']:
-                for group in result['Groups']:
-                    service_name = group['Keys'][0] if group['Keys'] else 'Unknown Service'
-                    amount = float(group['Metrics']['BlendedCost']['Amount'])
-                    
-                    if service_name in service_costs:
-                        service_costs[service_name] += amount
-                    else:
-                        service_costs[service_name] = amount
-            
-            # Convert to list of dictionaries and sort by cost (descending)
-            service_list = []
-            for service, cost in service_costs.items():
-                if cost > 0:  # Only include services with actual costs
-                    service_list.append({
-                        'Service': service,
-                        'Amount': f"${cost:,.2f}"
-                    })
+            # Sort by the raw cost (descending), only including services with actual costs
+            service_costs = service_costs[service_costs > 0].sort_values(ascending=False, kind='stable')
             
-            # Sort by cost amount (descending)
-            service_list.sort(key=lambda x: float(x['Amount'].replace('$', '').replace(',', '')), reverse=True)
+            # Format each amount once, after ranking
+            service_list = [
+                {
+                    'Service': service,
+                    'Amount': _format_usd(cost),
+                    'Amount_Numeric': float(cost)
+                }
+                for service, cost in service_costs.items()
+            ]
             
-            logger.info(f"Successfully retrieved cost data for {len(service_list)} services")
+            logger.info("Successfully retrieved cost data for %s services", len(service_list))
             return service_list
             
         except Exception as e:
-            logger.error(f"Error fetching service costs: {str(e)}")
+            logger.error("Error fetching service costs: %s", e)
             raise Exception(f"Failed to fetch service cost data: {str(e)}")
     
-    def get_daily_costs(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
+    def get_daily_costs(self, start_date: datetime, end_date: datetime, resolution: str = 'daily') -> List[Dict[str, Any]]:
         """
         Get daily cost data for the specified date range
         
         Args:
             start_date: Start date for cost data
             end_date: End date for cost data
+            resolution: 'daily', 'weekly' (7-day buckets of the daily data), 'monthly' (one MONTHLY
+                request), or 'auto' for daily up to DAILY_RESOLUTION_MAX_DAYS and weekly beyond; any other
+                value raises ValueError
             
         Returns:
-            List of dictionaries containing daily cost data
+            List of dictionaries containing daily cost data, one per day, week or month
         """
+        if resolution not in DAILY_COST_RESOLUTIONS:
+            raise ValueError(f"Unknown resolution {resolution!r}; expected one of {', '.join(DAILY_COST_RESOLUTIONS)}")
+        
         try:
-            logger.info(f"Fetching daily costs from {start_date.date()} to {end_date.date()}")
+            days = (end_date - start_date).days
+            if resolution == 'auto':
+                resolution = 'daily' if days <= DAILY_RESOLUTION_MAX_DAYS else 'weekly'
+            if resolution == 'daily' and days > 90:
+                logger.warning("DAILY granularity requested for a %s-day window; consider weekly or monthly resolution", days)
+            
+            logger.info("Fetching %s costs from %s to %s", resolution, start_date.date(), end_date.date())
             
-            response = self.cost_explorer.get_cost_and_usage(
+            response = self._get_cost_and_usage(
                 TimePeriod={
                     'Start': start_date.strftime('%Y-%m-%d'),
                     'End': end_date.strftime('%Y-%m-%d')
                 },
-                Granularity='DAILY',
+                Granularity='MONTHLY' if resolution == 'monthly' else 'DAILY',
                 Metrics=['BlendedCost']
             )
             
-            daily_costs = []
+            daily_totals = [
+                (result['TimePeriod']['Start'], float(_get_amount(_get_blended(result['Total']))))
+                for result in response['ResultsByTime']
+            ]
             
-            for result in response['ResultsByTime']:
-                date = result['TimePeriod']['Start']
-                total_cost = float(result['Total']['BlendedCost']['Amount'])
-                
-                daily_costs.append({
+            if resolution == 'weekly' and daily_totals:
+                # 7-day buckets starting at the first returned day, labelled by their first day
+                dates, amounts = zip(*daily_totals)
+                weekly = pd.Series(amounts, index=pd.to_datetime(dates)).resample('7D').sum()
+                daily_totals = [(period.strftime('%Y-%m-%d'), float(total)) for period, total in weekly.items()]
+            
+            daily_costs = [
+                {
                     'Date': date,
-                    'Amount': f"${total_cost:,.2f}"
-                })
+                    'Amount': _format_usd(total_cost),
+                    'Amount_Numeric': total_cost
+                }
+                for date, total_cost in daily_totals
+            ]
             
-            logger.info(f"Successfully retrieved {len(daily_costs)} days of cost data")
+            logger.info("Successfully retrieved %s %s cost records", len(daily_costs), resolution)
             return daily_costs
             
         except Exception as e:
-            logger.error(f"Error fetching daily costs: {str(e)}")
+            logger.error("Error fetching daily costs: %s", e)
             raise Exception(f"Failed to fetch daily cost data: {str(e)}")
     
     def get_cost_forecast(self, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
@@ -218,7 +862,7 @@ class AWSCostService:
             Dictionary containing forecast data
         """
         try:
-            logger.info(f"Fetching cost forecast from {start_date.date()} to {end_date.date()}")
+            logger.info("Fetching cost forecast from %s to %s", start_date.date(), end_date.date())
             
             response = self.cost_explorer.get_cost_forecast(
                 TimePeriod={
@@ -229,22 +873,70 @@ class AWSCostService:
                 Granularity='MONTHLY'
             )
             
-            total_forecast = float(response['Total']['Amount'])
+            total_forecast = _format_usd(float(response['Total']['Amount']))
             
             forecast_data = {
-                'Total': f"${total_forecast:,.2f}",
-                'Period': f"{start_date.strftime('%B %Y')} - {end_date.strftime('%B %Y')}",
-                'MeanValue': f"${float(response['Total']['Amount']):,.2f}"
+                'Total': total_forecast,
+                'Period': f"{_month_label(start_date.date().isoformat())} - {_month_label(end_date.date().isoformat())}",
+                'MeanValue': total_forecast
             }
             
             logger.info("Successfully retrieved cost forecast")
             return forecast_data
             
         except Exception as e:
-            logger.error(f"Error fetching cost forecast: {str(e)}")
+            logger.error("Error fetching cost forecast: %s", e)
             raise Exception(f"Failed to fetch cost forecast: {str(e)}")
     
-    def get_service_detailed_costs(self, service_name: str, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+    def get_dashboard_costs(self, start_date: datetime, end_date: datetime, include_daily: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch the independent dashboard datasets concurrently
+        
+        Args:
+            start_date: Start date for cost data
+            end_date: End date for cost data
+            include_daily: Whether to also fetch daily cost data
+            
+        Returns:
+            Dictionary with 'monthly_costs', 'service_costs' and 'daily_costs' lists
+        """
+        monthly_future, service_future, daily_future = self._submit_dashboard_requests(start_date, end_date, include_daily)
+        return {
+            'monthly_costs': monthly_future.result(),
+            'service_costs': service_future.result(),
+            'daily_costs': daily_future.result() if daily_future else []
+        }
+    
+    async def get_dashboard_costs_async(self, start_date: datetime, end_date: datetime, include_daily: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Async variant of get_dashboard_costs for callers that run an event loop
+        
+        Args:
+            start_date: Start date for cost data
+            end_date: End date for cost data
+            include_daily: Whether to also fetch daily cost data
+            
+        Returns:
+            Dictionary with 'monthly_costs', 'service_costs' and 'daily_costs' lists
+        """
+        monthly_future, service_future, daily_future = self._submit_dashboard_requests(start_date, end_date, include_daily)
+        monthly_costs, service_costs = await asyncio.gather(asyncio.wrap_future(monthly_future), asyncio.wrap_future(service_future))
+        return {
+            'monthly_costs': monthly_costs,
+            'service_costs': service_costs,
+            'daily_costs': await asyncio.wrap_future(daily_future) if daily_future else []
+        }
+    
+    def _submit_dashboard_requests(self, start_date: datetime, end_date: datetime, include_daily: bool):
+        """Submit the monthly, service and (optionally) daily requests to the shared pool"""
+        # boto3 clients are thread-safe, so the requests can be in flight together; the monthly and
+        # service views share one SERVICE-grouped response, fetched by whichever task gets there first.
+        monthly_future = _EXECUTOR.submit(self.get_monthly_costs, start_date, end_date)
+        service_future = _EXECUTOR.submit(self.get_costs_by_service, start_date, end_date)
+        daily_future = _EXECUTOR.submit(self.get_daily_costs, start_date, end_date) if include_daily else None
+        return monthly_future, service_future, daily_future
+    
+    def get_service_detailed_costs(self, service_name: str, start_date: datetime, end_date: datetime, months: int = MAX_MONTHS_DEFAULT) -> Dict[str, Any]:
         """
         Get detailed cost breakdown for a specific AWS service with resource-level granularity
         
@@ -252,282 +944,441 @@ class AWSCostService:
             service_name: Name of the AWS service
             start_date: Start date for cost data
             end_date: End date for cost data
+            months: Number of months to request; a longer range is clipped to the latest ones
+            
+        Returns:
+            Dictionary containing detailed service cost breakdown
+        """
+        return self.get_services_detailed_costs([service_name], start_date, end_date, months)[service_name]
+    
+    def get_services_detailed_costs(self, service_names: List[str], start_date: datetime, end_date: datetime, months: int = MAX_MONTHS_DEFAULT) -> Dict[str, Dict[str, Any]]:
+        """
+        Get detailed cost breakdowns for several AWS services with one Cost Explorer request per dimension
+        
+        Args:
+            service_names: Names of the AWS services
+            start_date: Start date for cost data
+            end_date: End date for cost data
+            months: Number of months to request; a longer range is clipped to the latest ones
+            
+        Returns:
+            Dictionary mapping each service name to its detailed cost breakdown
+        """
+        # Cost Explorer rejects an empty Values list; duplicate names would only repeat filter values
+        service_names = list(dict.fromkeys(service_names))
+        if not service_names:
+            return {}
+        
+        try:
+            # Only request the months the caller renders
+            clipped_start = _clip_range(start_date, end_date, months)
+            if clipped_start != start_date:
+                logger.info("Clipped detail range start from %s to %s (%s months)", start_date.date(), clipped_start.date(), months)
+                start_date = clipped_start
+            
+            logger.info("Fetching detailed costs for %s services from %s to %s", len(service_names), start_date.date(), end_date.date())
+            
+            usage_breakdowns = {name: [] for name in service_names}
+            resource_breakdowns = {name: [] for name in service_names}
+            monthly_data = {name: {} for name in service_names}
+            
+            # One TimePeriod shared by every request below
+            time_period = {'Start': start_date.strftime('%Y-%m-%d'), 'End': end_date.strftime('%Y-%m-%d')}
+            
+            # Cost Explorer allows two GroupBy keys per request. Several services need SERVICE as one of
+            # them to demultiplex the rows, so each resource dimension gets its own request; a single
+            # service needs no SERVICE key, so two dimensions are folded into each request instead.
+            # Dimensions a service only ever reports as the empty value are not requested for it.
+            single_service = service_names[0] if len(service_names) == 1 else None
+            if single_service:
+                group_keys = ['USAGE_TYPE', *_detail_dimensions(single_service)]
+                detail_requests = [(group_keys[i:i + 2], service_names) for i in range(0, len(group_keys), 2)]
+            else:
+                service_dimensions = {name: _detail_dimensions(name) for name in service_names}
+                detail_requests = [(['SERVICE', 'USAGE_TYPE'], service_names)] + [
+                    (['SERVICE', dimension_key], dimension_services)
+                    for dimension_key in _DETAIL_DIMENSIONS
+                    if (dimension_services := [name for name in service_names if dimension_key in service_dimensions[name]])
+                ]
+            
+            # All requests are in flight together; the first one carries the usage type breakdown and is
+            # the only one whose usage quantities are read, so the others ask for BlendedCost alone
+            detail_params = [
+                (group_keys, {
+                    'TimePeriod': time_period,
+                    'Granularity': 'MONTHLY',
+                    'Metrics': ['BlendedCost', 'UsageQuantity'] if 'USAGE_TYPE' in group_keys else ['BlendedCost'],
+                    'GroupBy': [{'Type': 'DIMENSION', 'Key': key} for key in group_keys],
+                    'Filter': {
+                        'Dimensions': {
+                            'Key': 'SERVICE',
+                            'Values': request_services
+                        }
+                    }
+                })
+                for group_keys, request_services in detail_requests
+            ]
+            detail_futures = [
+                (group_keys, _EXECUTOR.submit(self._get_cost_and_usage, **params))
+                for group_keys, params in detail_params
+            ]
+            # A single service can also be broken down by real resource IDs, where the account has them
+            resource_id_future = _EXECUTOR.submit(self.get_service_resource_costs, single_service) if single_service else None
+            
+            usage_keys, usage_future = detail_futures[0]
+            try:
+                usage_response = usage_future.result()
+            except Exception as e:
+                if not single_service or len(usage_keys) == 1:
+                    raise
+                # A dimension folded into the usage type request must not take the usage type breakdown
+                # down with it, so the request is repeated by USAGE_TYPE alone and the dimension skipped
+                logger.warning("%s grouping not available for %s, retrying by USAGE_TYPE only: %s", ' + '.join(usage_keys), single_service, e)
+                usage_keys = ['USAGE_TYPE']
+                usage_response = self._get_cost_and_usage(**dict(detail_params[0][1], GroupBy=[{'Type': 'DIMENSION', 'Key': 'USAGE_TYPE'}]))
+            usage_df = _groups_frame(usage_response, usage_keys, single_service)
+            detail_frames = [usage_df]
+            for group_keys, detail_future in detail_futures[1:]:
+                try:
+                    detail_frames.append(_groups_frame(detail_future.result(), group_keys, single_service, include_usage=False))
+                except Exception as e:
+                    logger.debug("%s grouping not available for %s: %s", ' + '.join(group_keys), ', '.join(service_names), e)
+            
+            # Filter, aggregate and sort vectorized; summing per usage type folds away a second dimension
+            usage_df = usage_df.groupby(['SERVICE', 'Month', 'USAGE_TYPE'], sort=False)[['Cost_Numeric', 'Usage_Numeric']].sum().reset_index()
+            usage_df = usage_df[(usage_df['Cost_Numeric'] > 0) & usage_df['SERVICE'].isin(service_names)]
+            usage_df = usage_df.rename(columns={'USAGE_TYPE': 'Usage_Type'})
+            
+            for service, service_df in usage_df.groupby('SERVICE', sort=False):
+                # sort=False keeps months in the chronological order Cost Explorer returned them
+                monthly_data[service] = service_df.groupby('Month', sort=False)['Cost_Numeric'].sum().to_dict()
+                usage_breakdowns[service] = service_df.sort_values('Cost_Numeric', ascending=False, kind='stable')[
+                    ['Month', 'Usage_Type', 'Cost_Numeric', 'Usage_Numeric']
+                ].to_dict('records')
+            
+            # Per-month cost of every attribute value, for whichever request carried each dimension
+            for dimension_key, (dimension_name, empty_value, _, _) in _DETAIL_DIMENSIONS.items():
+                dimension_df = next((df for df in detail_frames if dimension_key in df.columns), None)
+                if dimension_df is None:
+                    continue
+                
+                dimension_df = dimension_df.groupby(['SERVICE', 'Month', dimension_key], sort=False)['Cost_Numeric'].sum().reset_index()
+                dimension_df = dimension_df[
+                    (dimension_df['Cost_Numeric'] > 0)
+                    & ~dimension_df[dimension_key].isin([empty_value, ''])
+                    & dimension_df['SERVICE'].isin(service_names)
+                ]
+                for service, resource_value, cost in zip(dimension_df['SERVICE'], dimension_df[dimension_key], dimension_df['Cost_Numeric']):
+                    resource_breakdowns[service].append({
+                        'Resource_Type': resource_value,
+                        'Cost_Numeric': float(cost),
+                        'Category': dimension_name
+                    })
+            
+            resource_id_breakdown = []
+            if resource_id_future:
+                try:
+                    resource_id_breakdown = resource_id_future.result()
+                except Exception as e:
+                    logger.debug("Resource ID breakdown not available for %s: %s", single_service, e)
+            
+            detailed_costs = {}
+            for service_name in service_names:
+                resource_breakdown = resource_breakdowns[service_name]
+                usage_breakdown = usage_breakdowns[service_name]
+                
+                # Keep the top 20 resources by cost (descending) without sorting the full list
+                resource_breakdown = heapq.nlargest(20, resource_breakdown, key=_get_cost)
+                
+                if not resource_breakdown:
+                    logger.warning("Could not fetch detailed resource data for %s using available dimensions", service_name)
+                
+                # Calculate total cost for the service
+                total_cost = sum(item['Cost_Numeric'] for item in usage_breakdown)
+                
+                detailed_costs[service_name] = {
+                    'service_name': service_name,
+                    'total_cost': total_cost,
+                    'usage_breakdown': usage_breakdown,
+                    'resource_breakdown': resource_breakdown,
+                    'resource_id_breakdown': resource_id_breakdown if service_name == single_service else [],
+                    'monthly_data': monthly_data[service_name]
+                }
+            
+            return detailed_costs
+            
+        except Exception as e:
+            logger.error("Error fetching detailed costs for %s: %s", ', '.join(service_names), e)
+            raise Exception(f"Failed to fetch detailed cost data for {', '.join(service_names)}: {str(e)}")
+    
+    async def get_services_detailed_costs_async(self, service_names: List[str], start_date: datetime, end_date: datetime, months: int = MAX_MONTHS_DEFAULT) -> Dict[str, Dict[str, Any]]:
+        """Async variant of get_services_detailed_costs; takes the same arguments and returns the same result"""
+        return await _run_blocking(self.get_services_detailed_costs, service_names, start_date, end_date, months)
+    
+    async def get_service_detailed_costs_async(self, service_name: str, start_date: datetime, end_date: datetime, months: int = MAX_MONTHS_DEFAULT) -> Dict[str, Any]:
+        """Async variant of get_service_detailed_costs; takes the same arguments and returns the same result"""
+        return await _run_blocking(self.get_service_detailed_costs, service_name, start_date, end_date, months)
+    
+    def get_service_resource_costs(self, service_name: str) -> List[Dict[str, Any]]:
+        """
+        Get costs per resource ID for a service over the trailing RESOURCE_DATA_DAYS days
+        
+        Uses get_cost_and_usage_with_resources, which returns real resource IDs but only when
+        resource-level data is enabled in the account's Cost Explorer preferences.
+        
+        Args:
+            service_name: Name of the AWS service
+            
+        Returns:
+            Top 20 resources by cost, or an empty list if resource-level data is not available
+        """
+        if self._cache_namespace in _RESOURCE_DATA_UNAVAILABLE:
+            return []
+        
+        try:
+            end = date.today()
+            start = end - timedelta(days=RESOURCE_DATA_DAYS - 1)
+            response = self._get_cost_and_usage(
+                'get_cost_and_usage_with_resources',
+                TimePeriod={'Start': start.isoformat(), 'End': end.isoformat()},
+                Granularity='DAILY',
+                Metrics=['BlendedCost'],
+                GroupBy=[{'Type': 'DIMENSION', 'Key': 'RESOURCE_ID'}],
+                Filter={
+                    'Dimensions': {
+                        'Key': 'SERVICE',
+                        'Values': [service_name]
+                    }
+                }
+            )
+            
+            resource_df = _groups_frame(response, ['RESOURCE_ID'], service_name, include_usage=False)
+            if resource_df.empty:
+                return []
+            resource_costs = resource_df.groupby('RESOURCE_ID', sort=False)['Cost_Numeric'].sum().nlargest(20)
+            return [
+                {'Resource_ID': resource_id, 'Cost_Numeric': float(cost)}
+                for resource_id, cost in resource_costs.items()
+                if cost > 0
+            ]
+            
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('DataUnavailableException', 'AccessDeniedException'):
+                logger.info("Resource-level cost data is not available: %s", e)
+                _RESOURCE_DATA_UNAVAILABLE.add(self._cache_namespace)
+                return []
+            logger.error("Error fetching resource-level costs for %s: %s", service_name, e)
+            raise Exception(f"Failed to fetch resource-level costs for {service_name}: {str(e)}")
+        except Exception as e:
+            logger.error("Error fetching resource-level costs for %s: %s", service_name, e)
+            raise Exception(f"Failed to fetch resource-level costs for {service_name}: {str(e)}")
+    
+    def generate_ai_recommendations(self, service_data: Dict[str, Any], all_services_data: List[Dict[str, Any]],
+                                    total_aws_spend: Optional[float] = None) -> str:
+        """
+        Generate AI-powered cost optimization recommendations using AWS Bedrock
+        
+        Args:
+            service_data: Detailed cost data for the specific service
+            all_services_data: Cost data for all services for context
+            total_aws_spend: Total of all_services_data when the caller already has it, so it is not summed per call
+            
+        Returns:
+            AI-generated recommendations as string
+        """
+        return ''.join(self.stream_ai_recommendations(service_data, all_services_data, total_aws_spend))
+    
+    async def generate_ai_recommendations_async(self, service_data: Dict[str, Any], all_services_data: List[Dict[str, Any]],
+                                                total_aws_spend: Optional[float] = None) -> str:
+        """Async variant of generate_ai_recommendations; takes the same arguments and returns the same result"""
+        return await _run_blocking(self.generate_ai_recommendations, service_data, all_services_data, total_aws_spend)
+    
+    def _recommendations_cache_key(self, service_data: Dict[str, Any]) -> str:
+        """Cache key for recommendations on the same model, service, rounded cost, top usage types and months"""
+        monthly_periods = list(service_data['monthly_data'])
+        return self._cache.make_key(self._cache_namespace, 'ai_recommendations', {
+            'model_id': self._BEDROCK_MODEL_ID,
+            'service_name': service_data['service_name'],
+            'total_cost': round(service_data['total_cost']),
+            'top_usage_types': sorted({item['Usage_Type'] for item in heapq.nlargest(5, service_data['usage_breakdown'], key=_get_cost)}),
+            'month_range': [monthly_periods[0], monthly_periods[-1]] if monthly_periods else []
+        })
+    
+    def _recommendations_prompt(self, service_data: Dict[str, Any], total_aws_spend: float) -> str:
+        """Render the per-service prompt context, with amounts rounded to cents"""
+        return self._PROMPT_TEMPLATE.format_map({
+            'service_name': service_data['service_name'],
+            'total_cost': service_data['total_cost'],
+            'pct': service_data['total_cost'] / total_aws_spend * 100,
+            'usage_breakdown_json': _json_dumps([_rounded_amounts(item) for item in heapq.nlargest(10, service_data['usage_breakdown'], key=_get_cost)]),  # Top 10 usage types
+            'resource_breakdown_json': _json_dumps([_rounded_amounts(item) for item in heapq.nlargest(10, service_data['resource_breakdown'], key=_get_cost)]),  # Top 10 resources
+            'monthly_trends_json': _json_dumps(_rounded_amounts(service_data['monthly_data']))
+        })
+    
+    def generate_ai_recommendations_batch(self, services_data: List[Dict[str, Any]], all_services_data: List[Dict[str, Any]],
+                                          total_aws_spend: Optional[float] = None) -> Dict[str, str]:
+        """
+        Generate AI-powered cost optimization recommendations for several services with one Bedrock call
+        
+        Args:
+            services_data: Detailed cost data for each service to analyze
+            all_services_data: Cost data for all services for context
+            total_aws_spend: Total of all_services_data when the caller already has it, so it is not summed per call
             
         Returns:
-            Dictionary containing detailed service cost breakdown
+            Dictionary mapping each service name to its AI-generated recommendations
         """
+        recommendations = {}
+        pending = []
+        for service_data in services_data:
+            cached = self._cache.get(self._recommendations_cache_key(service_data), self._cache.RECOMMENDATIONS_TTL_SECONDS)
+            if cached is not None:
+                recommendations[service_data['service_name']] = cached['text']
+            else:
+                pending.append(service_data)
+        
+        if not pending:
+            return recommendations
+        
         try:
-            logger.info(f"Fetching detailed costs for {service_name} from {start_date.date()} to {end_date.date()}")
+            if total_aws_spend is None:
+                total_aws_spend = sum(s['Amount_Numeric'] for s in all_services_data)
+            prompt = (
+                self._BATCH_PROMPT_HEAD
+                + self._BATCH_PROMPT_SEPARATOR.join(self._recommendations_prompt(service_data, total_aws_spend) for service_data in pending)
+                + self._BATCH_PROMPT_TAIL
+            )
             
-            # Get cost breakdown by usage type for the service
-            response = self.cost_explorer.get_cost_and_usage(
-                TimePeriod={
-                    'Start': start_date.strftime('%Y-%m-%d'),
-                    'End': end_date.strftime('%Y-%m-%d')
-                },
-                Granularity='MONTHLY',
-                Metrics=['BlendedCost', 'UsageQuantity'],
-                GroupBy=[
+            # One call for all services amortizes the request overhead and the system prompt
+            response = self.bedrock.converse(
+                modelId=self._BEDROCK_MODEL_ID,
+                system=self._SYSTEM_BLOCKS,
+                messages=[
                     {
-                        'Type': 'DIMENSION',
-                        'Key': 'USAGE_TYPE'
+                        'role': 'user',
+                        'content': [{'text': prompt}]
                     }
                 ],
-                Filter={
-                    'Dimensions': {
-                        'Key': 'SERVICE',
-                        'Values': [service_name]
-                    }
-                }
+                inferenceConfig={'maxTokens': 4096}
             )
             
-            usage_breakdown = []
-            monthly_data = {}
-            
-            # Process response to get usage type breakdown
-            for result in response['ResultsByTime']:
-                month = datetime.strptime(result['TimePeriod']['Start'], '%Y-%m-%d').strftime('%B %Y')
-                
-                for group in result['Groups']:
-                    usage_type = group['Keys'][0] if group['Keys'] else 'Unknown Usage Type'
-                    cost = float(group['Metrics']['BlendedCost']['Amount'])
-                    usage = float(group['Metrics']['UsageQuantity']['Amount'])
-                    
-                    if cost > 0:
-                        usage_breakdown.append({
-                            'Month': month,
-                            'Usage_Type': usage_type,
-                            'Cost': f"${cost:,.2f}",
-                            'Usage_Quantity': f"{usage:,.2f}",
-                            'Cost_Numeric': cost
-                        })
-                        
-                        if month not in monthly_data:
-                            monthly_data[month] = 0
-                        monthly_data[month] += cost
-            
-            # Get instance-level breakdown using valid dimensions
-            resource_breakdown = []
-            try:
-                # Try to get breakdown by instance type (works for EC2, RDS, etc.)
-                instance_response = self.cost_explorer.get_cost_and_usage(
-                    TimePeriod={
-                        'Start': start_date.strftime('%Y-%m-%d'),
-                        'End': end_date.strftime('%Y-%m-%d')
-                    },
-                    Granularity='MONTHLY',
-                    Metrics=['BlendedCost'],
-                    GroupBy=[
-                        {
-                            'Type': 'DIMENSION',
-                            'Key': 'INSTANCE_TYPE'
-                        }
-                    ],
-                    Filter={
-                        'Dimensions': {
-                            'Key': 'SERVICE',
-                            'Values': [service_name]
-                        }
-                    }
-                )
-                
-                for result in instance_response['ResultsByTime']:
-                    for group in result['Groups']:
-                        instance_type = group['Keys'][0] if group['Keys'] else 'Unknown Type'
-                        cost = float(group['Metrics']['BlendedCost']['Amount'])
-                        
-                        if cost > 0 and instance_type not in ['NoInstanceType', '']:
-                            resource_breakdown.append({
-                                'Resource_Type': instance_type,
-                                'Cost': f"${cost:,.2f}",
-                                'Cost_Numeric': cost,
-                                'Category': 'Instance Type'
-                            })
-                
-            except Exception as e:
-                logger.debug(f"Instance type grouping not available for {service_name}: {str(e)}")
-            
-            # Try to get breakdown by availability zone
-            try:
-                az_response = self.cost_explorer.get_cost_and_usage(
-                    TimePeriod={
-                        'Start': start_date.strftime('%Y-%m-%d'),
-                        'End': end_date.strftime('%Y-%m-%d')
-                    },
-                    Granularity='MONTHLY',
-                    Metrics=['BlendedCost'],
-                    GroupBy=[
-                        {
-                            'Type': 'DIMENSION',
-                            'Key': 'AZ'
-                        }
-                    ],
-                    Filter={
-                        'Dimensions': {
-                            'Key': 'SERVICE',
-                            'Values': [service_name]
-                        }
-                    }
-                )
-                
-                for result in az_response['ResultsByTime']:
-                    for group in result['Groups']:
-                        az = group['Keys'][0] if group['Keys'] else 'Unknown AZ'
-                        cost = float(group['Metrics']['BlendedCost']['Amount'])
-                        
-                        if cost > 0 and az not in ['NoAZ', '']:
-                            resource_breakdown.append({
-                                'Resource_Type': az,
-                                'Cost': f"${cost:,.2f}",
-                                'Cost_Numeric': cost,
-                                'Category': 'Availability Zone'
-                            })
-                
-            except Exception as e:
-                logger.debug(f"AZ grouping not available for {service_name}: {str(e)}")
-            
-            # Try to get breakdown by platform (for EC2)
-            try:
-                platform_response = self.cost_explorer.get_cost_and_usage(
-                    TimePeriod={
-                        'Start': start_date.strftime('%Y-%m-%d'),
-                        'End': end_date.strftime('%Y-%m-%d')
-                    },
-                    Granularity='MONTHLY',
-                    Metrics=['BlendedCost'],
-                    GroupBy=[
-                        {
-                            'Type': 'DIMENSION',
-                            'Key': 'PLATFORM'
-                        }
-                    ],
-                    Filter={
-                        'Dimensions': {
-                            'Key': 'SERVICE',
-                            'Values': [service_name]
-                        }
-                    }
-                )
-                
-                for result in platform_response['ResultsByTime']:
-                    for group in result['Groups']:
-                        platform = group['Keys'][0] if group['Keys'] else 'Unknown Platform'
-                        cost = float(group['Metrics']['BlendedCost']['Amount'])
-                        
-                        if cost > 0 and platform not in ['NoPlatform', '']:
-                            resource_breakdown.append({
-                                'Resource_Type': platform,
-                                'Cost': f"${cost:,.2f}",
-                                'Cost_Numeric': cost,
-                                'Category': 'Platform'
-                            })
-                
-            except Exception as e:
-                logger.debug(f"Platform grouping not available for {service_name}: {str(e)}")
-            
-            # Sort by cost (descending)
-            resource_breakdown.sort(key=lambda x: x['Cost_Numeric'], reverse=True)
-            
-            if not resource_breakdown:
-                logger.warning(f"Could not fetch detailed resource data for {service_name} using available dimensions")
-            
-            # Sort usage breakdown by cost
-            usage_breakdown.sort(key=lambda x: x['Cost_Numeric'], reverse=True)
+            text = ''.join(block.get('text', '') for block in response['output']['message']['content'])
+            batch = _json_loads(text[text.index('{'):text.rindex('}') + 1])['recommendations']
             
-            # Calculate total cost for the service
-            total_cost = sum([item['Cost_Numeric'] for item in usage_breakdown])
+            for service_data in pending:
+                service_name = service_data['service_name']
+                if batch.get(service_name):
+                    recommendations[service_name] = batch[service_name]
+                    self._cache.put(self._recommendations_cache_key(service_data), {'text': batch[service_name]})
+                else:
+                    recommendations[service_name] = "Unable to generate AI recommendations at this time. Error: the batched response did not include this service."
             
-            return {
-                'service_name': service_name,
-                'total_cost': total_cost,
-                'usage_breakdown': usage_breakdown,
-                'resource_breakdown': resource_breakdown[:20],  # Top 20 resources
-                'monthly_data': monthly_data
-            }
+            logger.info("Successfully generated AI recommendations for %s services in one call", len(pending))
             
         except Exception as e:
-            logger.error(f"Error fetching detailed costs for {service_name}: {str(e)}")
-            raise Exception(f"Failed to fetch detailed cost data for {service_name}: {str(e)}")
+            logger.error("Error generating batched AI recommendations: %s", e)
+            for service_data in pending:
+                recommendations[service_data['service_name']] = f"Unable to generate AI recommendations at this time. Error: {str(e)}\n\nPlease ensure you have access to AWS Bedrock Claude models in your region."
+        
+        return recommendations
     
-    def generate_ai_recommendations(self, service_data: Dict[str, Any], all_services_data: List[Dict[str, Any]]) -> str:
+    def stream_ai_recommendations(self, service_data: Dict[str, Any], all_services_data: List[Dict[str, Any]],
+                                  total_aws_spend: Optional[float] = None) -> Iterator[str]:
         """
-        Generate AI-powered cost optimization recommendations using AWS Bedrock
+        Stream AI-powered cost optimization recommendations from AWS Bedrock as they are generated
         
         Args:
             service_data: Detailed cost data for the specific service
             all_services_data: Cost data for all services for context
+            total_aws_spend: Total of all_services_data when the caller already has it, so it is not summed per call
             
-        Returns:
-            AI-generated recommendations as string
+        Yields:
+            Text fragments of the AI-generated recommendations
         """
+        parts = []
         try:
-            import json
-            
-            # Prepare context for the AI
-            context = {
-                "service_name": service_data['service_name'],
-                "total_cost": service_data['total_cost'],
-                "usage_breakdown": service_data['usage_breakdown'][:10],  # Top 10 usage types
-                "resource_breakdown": service_data['resource_breakdown'][:10],  # Top 10 resources
-                "monthly_trends": service_data['monthly_data'],
-                "total_aws_spend": sum([float(s['Amount'].replace('$', '').replace(',', '')) for s in all_services_data])
-            }
-            
-            prompt = f"""
-            You are an AWS FinOps expert analyzing cost data. Based on the following AWS service cost breakdown, provide specific, actionable cost optimization recommendations.
-
-            Service Analysis:
-            - Service: {context['service_name']}
-            - Total Cost (6 months): ${context['total_cost']:,.2f}
-            - Percentage of total AWS spend: {(context['total_cost'] / context['total_aws_spend'] * 100):.1f}%
-
-            Usage Breakdown (Top cost drivers):
-            {json.dumps(context['usage_breakdown'], indent=2)}
-
-            Resource Breakdown (if available):
-            {json.dumps(context['resource_breakdown'], indent=2)}
-
-            Monthly Trends:
-            {json.dumps(context['monthly_trends'], indent=2)}
-
-            Please provide:
-            1. **Immediate Cost Optimization Opportunities** (3-5 specific actions)
-            2. **Resource Right-Sizing Recommendations** (if applicable)
-            3. **Architecture Optimization Suggestions**
-            4. **Potential Monthly Savings Estimate**
-            5. **Implementation Priority** (High/Medium/Low for each recommendation)
-
-            Keep recommendations practical, specific to the usage patterns shown, and include estimated savings percentages where possible.
-            """
-            
-            # Call AWS Bedrock Claude model
-            body = json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 2000,
-                "messages": [
+            # Reuse a completed answer for the same service, rounded cost, top usage types and months
+            cache_key = self._recommendations_cache_key(service_data)
+            cached = self._cache.get(cache_key, self._cache.RECOMMENDATIONS_TTL_SECONDS)
+            if cached is not None:
+                logger.info("Using cached AI recommendations for %s", service_data['service_name'])
+                yield cached['text']
+                return
+            
+            if total_aws_spend is None:
+                total_aws_spend = sum(s['Amount_Numeric'] for s in all_services_data)
+            prompt = self._recommendations_prompt(service_data, total_aws_spend)
+            
+            # Call the AWS Bedrock Claude model through the Converse API
+            response = self.bedrock.converse_stream(
+                modelId=self._BEDROCK_MODEL_ID,
+                system=self._SYSTEM_BLOCKS,
+                messages=[
                     {
-                        "role": "user",
-                        "content": prompt
+                        'role': 'user',
+                        'content': [{'text': prompt}]
                     }
-                ]
-            })
-            
-            response = self.bedrock.invoke_model(
-                modelId="anthropic.claude-3-sonnet-20240229-v1:0",
-                contentType="application/json",
-                accept="application/json",
-                body=body
+                ],
+                inferenceConfig={'maxTokens': 2000}
             )
             
-            response_body = json.loads(response['body'].read())
-            recommendations = response_body['content'][0]['text']
-            
-            logger.info(f"Successfully generated AI recommendations for {service_data['service_name']}")
-            return recommendations
+            # Yield text deltas as soon as Bedrock emits them; the stream's connection is released
+            # even when the caller stops reading early
+            with closing(response['stream']) as stream:
+                for event in stream:
+                    if 'contentBlockDelta' in event:
+                        text = event['contentBlockDelta']['delta'].get('text', '')
+                        parts.append(text)
+                        yield text
+                        continue
+                    # Error events (throttling, model stream errors, ...) end the stream; raising keeps a
+                    # truncated answer out of the recommendations cache
+                    error_type = next((key for key in event if key.endswith('Exception')), None)
+                    if error_type:
+                        raise Exception(f"{error_type}: {event[error_type].get('message', '')}")
+            
+            if parts:
+                self._cache.put(cache_key, {'text': ''.join(parts)})
+            logger.info("Successfully generated AI recommendations for %s", service_data['service_name'])
             
         except Exception as e:
-            logger.error(f"Error generating AI recommendations: {str(e)}")
-            return f"Unable to generate AI recommendations at this time. Error: {str(e)}\n\nPlease ensure you have access to AWS Bedrock Claude models in your region."
+            logger.error("Error generating AI recommendations: %s", e)
+            # Separate the error from any partial answer that was already streamed
+            separator = '\n\n' if parts else ''
+            yield f"{separator}Unable to generate AI recommendations at this time. Error: {str(e)}\n\nPlease ensure you have access to AWS Bedrock Claude models in your region."
+    
+    async def stream_ai_recommendations_async(self, service_data: Dict[str, Any], all_services_data: List[Dict[str, Any]],
+                                              total_aws_spend: Optional[float] = None) -> AsyncIterator[str]:
+        """
+        Async variant of stream_ai_recommendations for callers that run an event loop
+        
+        Args:
+            service_data: Detailed cost data for the specific service
+            all_services_data: Cost data for all services for context
+            total_aws_spend: Total of all_services_data when the caller already has it, so it is not summed per call
+            
+        Yields:
+            Text fragments of the AI-generated recommendations
+        """
+        # Each blocking read of the Bedrock stream runs on the loop's default executor, so the loop
+        # keeps serving other work between fragments
+        loop = asyncio.get_running_loop()
+        fragments = self.stream_ai_recommendations(service_data, all_services_data, total_aws_spend)
+        end = object()
+        read = None
+        try:
+            while True:
+                read = loop.run_in_executor(None, next, fragments, end)
+                # Shielded, so cancelling the caller leaves the in-flight read running to completion
+                fragment = await asyncio.shield(read)
+                if fragment is end:
+                    break
+                yield fragment
+        finally:
+            # The generator cannot be closed while a read is still executing it, so wait for that read first
+            if read is not None and not read.done():
+                await asyncio.wait([read])
+            fragments.close()
     
     def get_usage_type_details(self, service_name: str, usage_type: str, month: str, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
         """
@@ -544,21 +1395,31 @@ class AWSCostService:
             Dictionary containing detailed usage type breakdown
         """
         try:
-            logger.info(f"Fetching detailed breakdown for {service_name} - {usage_type} in {month}")
+            logger.info("Fetching detailed breakdown for %s - %s in %s", service_name, usage_type, month)
             
             # Parse month to get specific date range
-            month_start = datetime.strptime(month, '%Y-%m')
-            if month_start.month == 12:
-                month_end = month_start.replace(year=month_start.year + 1, month=1, day=1)
-            else:
-                month_end = month_start.replace(month=month_start.month + 1, day=1)
+            month_start, month_end = _month_bounds(month)
+            time_period = {'Start': month_start.strftime('%Y-%m-%d'), 'End': month_end.strftime('%Y-%m-%d')}
+            usage_type_filter = _usage_type_filter(service_name, usage_type)
+            
+            # Start the region breakdown request so it runs while the daily operation data is fetched
+            region_future = _EXECUTOR.submit(
+                self._get_cost_and_usage,
+                TimePeriod=time_period,
+                Granularity='MONTHLY',
+                Metrics=['BlendedCost'],
+                GroupBy=[
+                    {
+                        'Type': 'DIMENSION',
+                        'Key': 'REGION'
+                    }
+                ],
+                Filter=usage_type_filter
+            )
             
             # Get detailed breakdown with multiple dimensions
-            response = self.cost_explorer.get_cost_and_usage(
-                TimePeriod={
-                    'Start': month_start.strftime('%Y-%m-%d'),
-                    'End': month_end.strftime('%Y-%m-%d')
-                },
+            response = self._get_cost_and_usage(
+                TimePeriod=time_period,
                 Granularity='DAILY',
                 Metrics=['BlendedCost', 'UsageQuantity'],
                 GroupBy=[
@@ -567,126 +1428,52 @@ class AWSCostService:
                         'Key': 'OPERATION'
                     }
                 ],
-                Filter={
-                    'And': [
-                        {
-                            'Dimensions': {
-                                'Key': 'SERVICE',
-                                'Values': [service_name]
-                            }
-                        },
-                        {
-                            'Dimensions': {
-                                'Key': 'USAGE_TYPE',
-                                'Values': [usage_type]
-                            }
-                        }
-                    ]
-                }
+                Filter=usage_type_filter
             )
             
-            daily_breakdown = []
-            operation_breakdown = {}
-            total_cost = 0
-            total_usage = 0
+            # Flatten the daily response in one pass, then aggregate per day and per operation vectorized;
+            # amounts stay numeric and are formatted by the view
+            rows = [
+                (
+                    result['TimePeriod']['Start'],
+                    group['Keys'][0] if group['Keys'] else 'Unknown Operation',
+                    float(_get_amount(_get_blended(group['Metrics']))),
+                    float(_get_amount(_get_usage(group['Metrics'])))
+                )
+                for result in response['ResultsByTime']
+                for group in result['Groups']
+            ]
+            daily_df = pd.DataFrame(rows, columns=['Date', 'Operation', 'Cost_Numeric', 'Usage_Numeric'])
+            total_cost = float(daily_df['Cost_Numeric'].sum())
+            total_usage = float(daily_df['Usage_Numeric'].sum())
             
-            # Process daily data
-            for result in response['ResultsByTime']:
-                date = result['TimePeriod']['Start']
-                daily_cost = 0
-                daily_usage = 0
-                
-                for group in result['Groups']:
-                    operation = group['Keys'][0] if group['Keys'] else 'Unknown Operation'
-                    cost = float(group['Metrics']['BlendedCost']['Amount'])
-                    usage = float(group['Metrics']['UsageQuantity']['Amount'])
-                    
-                    daily_cost += cost
-                    daily_usage += usage
-                    
-                    if operation not in operation_breakdown:
-                        operation_breakdown[operation] = {'cost': 0, 'usage': 0}
-                    operation_breakdown[operation]['cost'] += cost
-                    operation_breakdown[operation]['usage'] += usage
-                
-                if daily_cost > 0:
-                    daily_breakdown.append({
-                        'Date': date,
-                        'Cost': f"${daily_cost:,.2f}",
-                        'Usage_Quantity': f"{daily_usage:,.2f}",
-                        'Cost_Numeric': daily_cost,
-                        'Usage_Numeric': daily_usage
-                    })
-                
-                total_cost += daily_cost
-                total_usage += daily_usage
-            
-            # Convert operation breakdown to list
-            operations = []
-            for operation, data in operation_breakdown.items():
-                if data['cost'] > 0:
-                    operations.append({
-                        'Operation': operation,
-                        'Cost': f"${data['cost']:,.2f}",
-                        'Usage_Quantity': f"{data['usage']:,.2f}",
-                        'Cost_Numeric': data['cost'],
-                        'Usage_Numeric': data['usage']
-                    })
+            daily_totals = daily_df.groupby('Date')[['Cost_Numeric', 'Usage_Numeric']].sum().reset_index()
+            daily_breakdown = daily_totals[daily_totals['Cost_Numeric'] > 0].to_dict('records')
             
-            # Sort by cost (descending)
-            operations.sort(key=lambda x: x['Cost_Numeric'], reverse=True)
-            daily_breakdown.sort(key=lambda x: x['Date'])
+            # Operations by cost (descending); the stable sort keeps first-seen order for ties
+            operation_totals = daily_df.groupby('Operation', sort=False)[['Cost_Numeric', 'Usage_Numeric']].sum().reset_index()
+            operation_totals = operation_totals[operation_totals['Cost_Numeric'] > 0]
+            operations = operation_totals.sort_values('Cost_Numeric', ascending=False, kind='stable').to_dict('records')
             
             # Get region breakdown if available
             try:
-                region_response = self.cost_explorer.get_cost_and_usage(
-                    TimePeriod={
-                        'Start': month_start.strftime('%Y-%m-%d'),
-                        'End': month_end.strftime('%Y-%m-%d')
-                    },
-                    Granularity='MONTHLY',
-                    Metrics=['BlendedCost'],
-                    GroupBy=[
-                        {
-                            'Type': 'DIMENSION',
-                            'Key': 'REGION'
-                        }
-                    ],
-                    Filter={
-                        'And': [
-                            {
-                                'Dimensions': {
-                                    'Key': 'SERVICE',
-                                    'Values': [service_name]
-                                }
-                            },
-                            {
-                                'Dimensions': {
-                                    'Key': 'USAGE_TYPE',
-                                    'Values': [usage_type]
-                                }
-                            }
-                        ]
-                    }
-                )
+                region_response = region_future.result()
                 
-                regions = []
-                for result in region_response['ResultsByTime']:
-                    for group in result['Groups']:
-                        region = group['Keys'][0] if group['Keys'] else 'Unknown Region'
-                        cost = float(group['Metrics']['BlendedCost']['Amount'])
-                        
-                        if cost > 0:
-                            regions.append({
-                                'Region': region,
-                                'Cost': f"${cost:,.2f}",
-                                'Cost_Numeric': cost
-                            })
+                # A MONTHLY request for a single month returns exactly one period
+                region_groups = region_response['ResultsByTime'][0]['Groups'] if region_response['ResultsByTime'] else []
+                regions = [
+                    {
+                        'Region': group['Keys'][0] if group['Keys'] else 'Unknown Region',
+                        'Cost_Numeric': cost
+                    }
+                    for group in region_groups
+                    if (cost := float(_get_amount(_get_blended(group['Metrics'])))) > 0
+                ]
                 
-                regions.sort(key=lambda x: x['Cost_Numeric'], reverse=True)
+                regions.sort(key=_get_cost, reverse=True)
                 
             except Exception as e:
-                logger.warning(f"Could not fetch region data: {str(e)}")
+                logger.warning("Could not fetch region data: %s", e)
                 regions = []
             
             return {
@@ -701,9 +1488,13 @@ class AWSCostService:
             }
             
         except Exception as e:
-            logger.error(f"Error fetching usage type details: {str(e)}")
+            logger.error("Error fetching usage type details: %s", e)
             raise Exception(f"Failed to fetch usage type details: {str(e)}")
     
+    async def get_usage_type_details_async(self, service_name: str, usage_type: str, month: str, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """Async variant of get_usage_type_details; takes the same arguments and returns the same result"""
+        return await _run_blocking(self.get_usage_type_details, service_name, usage_type, month, start_date, end_date)
+    
     def get_actual_resource_names(self, service_name: str, usage_type: str, month: str) -> List[Dict[str, Any]]:
         """
         Get actual resource names and identifiers for specific services
@@ -716,148 +1507,180 @@ class AWSCostService:
         Returns:
             List of dictionaries containing actual resource information
         """
-        resources = []
+        # The inventory depends only on the service, not the usage type or month
+        cache_key = (self._cache_namespace, service_name)
+        cached = _RESOURCE_NAMES_CACHE.get(cache_key)
+        if cached and time.time() - cached[0] < RESOURCE_NAMES_TTL_SECONDS:
+            return list(cached[1])
         
         try:
-            # Amazon Q Business - get indices and applications
-            if 'Amazon Q' in service_name:
-                try:
-                    # Initialize Q Business client with correct region
-                    regions_to_try = ['us-east-1', 'us-west-2', 'eu-west-1']
-                    qbusiness = None
-                    
-                    for region in regions_to_try:
-                        try:
-                            qbusiness = boto3.client('qbusiness', region_name=region)
-                            # Test the connection
-                            applications = qbusiness.list_applications()
-                            break
-                        except Exception as e:
-                            logger.debug(f"Q Business not available in {region}: {str(e)}")
-                            continue
-                    
-                    if qbusiness:
-                        # List applications
-                        applications = qbusiness.list_applications()
-                        for app in applications.get('applications', []):
-                            app_id = app.get('applicationId')
-                            app_name = app.get('displayName', app_id)
-                            
-                            # Get indices for this application
-                            try:
-                                indices = qbusiness.list_indices(applicationId=app_id)
-                                for index in indices.get('indices', []):
-                                    index_id = index.get('indexId')
-                                    index_name = index.get('displayName', index_id)
-                                    resources.append({
-                                        'resource_name': index_name,
-                                        'resource_id': index_id,
-                                        'application': app_name,
-                                        'application_id': app_id,
-                                        'status': index.get('status', 'Unknown')
-                                    })
-                            except Exception as e:
-                                logger.debug(f"Could not list indices for app {app_id}: {str(e)}")
-                    else:
-                        logger.warning("Q Business service not available in any tested region")
-                            
-                except Exception as e:
-                    logger.warning(f"Could not access Q Business resources: {str(e)}")
-            
-            # EC2 instances
-            elif 'EC2' in service_name or 'Elastic Compute' in service_name:
-                try:
-                    response = self.ec2.describe_instances()
-                    for reservation in response['Reservations']:
-                        for instance in reservation['Instances']:
-                            instance_id = instance['InstanceId']
-                            name_tag = next((tag['Value'] for tag in instance.get('Tags', []) if tag['Key'] == 'Name'), f"EC2-{instance_id}")
-                            resources.append({
-                                'resource_name': name_tag,
-                                'resource_id': instance_id,
-                                'instance_type': instance.get('InstanceType', 'Unknown'),
-                                'state': instance.get('State', {}).get('Name', 'Unknown'),
-                                'az': instance.get('Placement', {}).get('AvailabilityZone', 'Unknown')
-                            })
-                except Exception as e:
-                    logger.warning(f"Could not list EC2 instances: {str(e)}")
-            
-            # RDS instances
-            elif 'RDS' in service_name or 'Relational Database' in service_name:
-                try:
-                    response = self.rds.describe_db_instances()
-                    for db in response['DBInstances']:
-                        db_id = db['DBInstanceIdentifier']
-                        db_name = db.get('DBName') or db_id
-                        resources.append({
-                            'resource_name': db_name,
-                            'resource_id': db_id,
-                            'instance_class': db.get('DBInstanceClass', 'Unknown'),
-                            'state': db.get('DBInstanceStatus', 'Unknown'),
-                            'engine': db.get('Engine', 'Unknown')
-                        })
-                except Exception as e:
-                    logger.warning(f"Could not list RDS instances: {str(e)}")
+            resources = getattr(self, _resource_lister(service_name))(service_name)
             
-            # S3 buckets
-            elif 'S3' in service_name or 'Simple Storage' in service_name:
-                try:
-                    response = self.s3.list_buckets()
-                    for bucket in response['Buckets']:
-                        bucket_name = bucket['Name']
-                        resources.append({
-                            'resource_name': bucket_name,
-                            'resource_id': bucket_name,
-                            'creation_date': bucket.get('CreationDate', 'Unknown')
-                        })
-                except Exception as e:
-                    logger.warning(f"Could not list S3 buckets: {str(e)}")
+            logger.info("Found %s resources for %s", len(resources), service_name)
+            # Empty listings are not cached, since they are usually a failed or denied call
+            if resources:
+                _RESOURCE_NAMES_CACHE[cache_key] = (time.time(), tuple(resources))
+            return resources
             
-            # Lambda functions
-            elif 'Lambda' in service_name:
+        except Exception as e:
+            logger.error("Error getting resource names for %s: %s", service_name, e)
+            return []
+
+    def _list_q_business_resources(self, service_name: str) -> List[Dict[str, Any]]:
+        """List Amazon Q Business indices, with their applications"""
+        resources = []
+        try:
+            # Probe the candidate regions concurrently; the first region in order that answers wins
+            regions_to_try = ['us-east-1', 'us-west-2', 'eu-west-1']
+            probe_futures = [
+                (region, _EXECUTOR.submit(lambda region=region: self._get_client('qbusiness', region).list_applications()))
+                for region in regions_to_try
+            ]
+            qbusiness = None
+            applications = None
+            for region, probe_future in probe_futures:
                 try:
-                    response = self.lambda_client.list_functions()
-                    for function in response['Functions']:
-                        function_name = function['FunctionName']
-                        resources.append({
-                            'resource_name': function_name,
-                            'resource_id': function_name,
-                            'runtime': function.get('Runtime', 'Unknown'),
-                            'state': function.get('State', 'Unknown')
-                        })
+                    applications = probe_future.result()
+                    qbusiness = self._get_client('qbusiness', region)
+                    break
                 except Exception as e:
-                    logger.warning(f"Could not list Lambda functions: {str(e)}")
-            
-            # Use Resource Groups Tagging API as fallback
+                    logger.debug("Q Business not available in %s: %s", region, e)
+                    continue
+            # Probes that have not started are dropped; ones already running finish in the background
+            for _, probe_future in probe_futures:
+                probe_future.cancel()
+            
+            if qbusiness:
+                # List the indices of every application concurrently
+                apps = applications.get('applications', [])
+                index_futures = [
+                    (app, _EXECUTOR.submit(qbusiness.list_indices, applicationId=app.get('applicationId')))
+                    for app in apps
+                ]
+                for app, index_future in index_futures:
+                    app_id = app.get('applicationId')
+                    app_name = app.get('displayName', app_id)
+                    
+                    # Get indices for this application
+                    try:
+                        indices = index_future.result()
+                        for index in indices.get('indices', []):
+                            index_id = index.get('indexId')
+                            index_name = index.get('displayName', index_id)
+                            resources.append({
+                                'resource_name': index_name,
+                                'resource_id': index_id,
+                                'application': app_name,
+                                'application_id': app_id,
+                                'status': index.get('status', 'Unknown')
+                            })
+                    except Exception as e:
+                        logger.debug("Could not list indices for app %s: %s", app_id, e)
             else:
-                try:
-                    # Try to get resources using the resource groups API
-                    response = self.resource_groups.get_resources(
-                        ResourcesPerPage=100,
-                        ResourceTypeFilters=[service_name] if service_name else []
-                    )
+                logger.warning("Q Business service not available in any tested region")
                     
-                    for resource in response.get('ResourceTagMappingList', []):
-                        arn = resource.get('ResourceARN', '')
-                        resource_id = arn.split('/')[-1] if '/' in arn else arn.split(':')[-1]
-                        name_tag = next((tag['Value'] for tag in resource.get('Tags', []) if tag['Key'] == 'Name'), resource_id)
-                        
-                        resources.append({
-                            'resource_name': name_tag,
-                            'resource_id': resource_id,
-                            'resource_type': arn.split(':')[2] if ':' in arn else 'Unknown',
-                            'arn': arn
-                        })
-                        
-                except Exception as e:
-                    logger.warning(f"Could not use Resource Groups API for {service_name}: {str(e)}")
-            
-            logger.info(f"Found {len(resources)} resources for {service_name}")
-            return resources
+        except Exception as e:
+            logger.warning("Could not access Q Business resources: %s", e)
+        return resources
+
+    def _list_ec2_resources(self, service_name: str) -> List[Dict[str, Any]]:
+        """List EC2 instances"""
+        resources = []
+        try:
+            # Every page, not just the first; 1000 is the largest page describe_instances returns
+            pages = self.ec2.get_paginator('describe_instances').paginate(PaginationConfig={'PageSize': 1000})
+            for reservation in (reservation for page in pages for reservation in page['Reservations']):
+                for instance in reservation['Instances']:
+                    instance_id = instance['InstanceId']
+                    name_tag = next((tag['Value'] for tag in instance.get('Tags', []) if tag['Key'] == 'Name'), f"EC2-{instance_id}")
+                    resources.append({
+                        'resource_name': name_tag,
+                        'resource_id': instance_id,
+                        'instance_type': instance.get('InstanceType', 'Unknown'),
+                        'state': instance.get('State', {}).get('Name', 'Unknown'),
+                        'az': instance.get('Placement', {}).get('AvailabilityZone', 'Unknown')
+                    })
+        except Exception as e:
+            logger.warning("Could not list EC2 instances: %s", e)
+        return resources
+
+    def _list_rds_resources(self, service_name: str) -> List[Dict[str, Any]]:
+        """List RDS DB instances"""
+        resources = []
+        try:
+            pages = self.rds.get_paginator('describe_db_instances').paginate(PaginationConfig={'PageSize': 100})
+            for db in (db for page in pages for db in page['DBInstances']):
+                db_id = db['DBInstanceIdentifier']
+                db_name = db.get('DBName') or db_id
+                resources.append({
+                    'resource_name': db_name,
+                    'resource_id': db_id,
+                    'instance_class': db.get('DBInstanceClass', 'Unknown'),
+                    'state': db.get('DBInstanceStatus', 'Unknown'),
+                    'engine': db.get('Engine', 'Unknown')
+                })
+        except Exception as e:
+            logger.warning("Could not list RDS instances: %s", e)
+        return resources
+
+    def _list_s3_resources(self, service_name: str) -> List[Dict[str, Any]]:
+        """List S3 buckets"""
+        resources = []
+        try:
+            pages = self.s3.get_paginator('list_buckets').paginate()
+            for bucket in (bucket for page in pages for bucket in page['Buckets']):
+                bucket_name = bucket['Name']
+                resources.append({
+                    'resource_name': bucket_name,
+                    'resource_id': bucket_name,
+                    'creation_date': bucket.get('CreationDate', 'Unknown')
+                })
+        except Exception as e:
+            logger.warning("Could not list S3 buckets: %s", e)
+        return resources
+
+    def _list_lambda_resources(self, service_name: str) -> List[Dict[str, Any]]:
+        """List Lambda functions"""
+        resources = []
+        try:
+            pages = self.lambda_client.get_paginator('list_functions').paginate(PaginationConfig={'PageSize': 50})
+            for function in (function for page in pages for function in page['Functions']):
+                function_name = function['FunctionName']
+                resources.append({
+                    'resource_name': function_name,
+                    'resource_id': function_name,
+                    'runtime': function.get('Runtime', 'Unknown'),
+                    'state': function.get('State', 'Unknown')
+                })
+        except Exception as e:
+            logger.warning("Could not list Lambda functions: %s", e)
+        return resources
+
+    def _list_tagged_resources(self, service_name: str) -> List[Dict[str, Any]]:
+        """List resources of a service through the Resource Groups Tagging API"""
+        resources = []
+        try:
+            # Try to get resources using the resource groups API
+            pages = self.resource_groups.get_paginator('get_resources').paginate(
+                ResourceTypeFilters=[service_name] if service_name else [],
+                PaginationConfig={'PageSize': 100}
+            )
             
+            for resource in (resource for page in pages for resource in page.get('ResourceTagMappingList', [])):
+                arn = resource.get('ResourceARN', '')
+                resource_id = arn.split('/')[-1] if '/' in arn else arn.split(':')[-1]
+                name_tag = next((tag['Value'] for tag in resource.get('Tags', []) if tag['Key'] == 'Name'), resource_id)
+                
+                resources.append({
+                    'resource_name': name_tag,
+                    'resource_id': resource_id,
+                    'resource_type': arn.split(':')[2] if ':' in arn else 'Unknown',
+                    'arn': arn
+                })
+                
         except Exception as e:
-            logger.error(f"Error getting resource names for {service_name}: {str(e)}")
-            return []
+            logger.warning("Could not use Resource Groups API for %s: %s", service_name, e)
+        return resources
 
     def get_resource_level_cost_breakdown(self, service_name: str, usage_type: str, month: str, 
                                         month_start: datetime, month_end: datetime) -> Dict[str, Any]:
@@ -875,7 +1698,7 @@ class AWSCostService:
             Dictionary containing detailed resource cost breakdown
         """
         try:
-            logger.info(f"Generating resource-level cost breakdown for {service_name} - {usage_type}")
+            logger.info("Generating resource-level cost breakdown for %s - %s", service_name, usage_type)
             
             breakdown = {
                 'service_name': service_name,
@@ -888,66 +1711,57 @@ class AWSCostService:
                 'optimization_opportunities': []
             }
             
+            # One TimePeriod shared by every request for the month
+            time_period = {'Start': month_start.strftime('%Y-%m-%d'), 'End': month_end.strftime('%Y-%m-%d')}
+            usage_type_filter = _usage_type_filter(service_name, usage_type)
+            
             # Get actual resources for this service
             actual_resources = self.get_actual_resource_names(service_name, usage_type, month)
             
             # Get daily cost breakdown for the month
-            daily_response = self.cost_explorer.get_cost_and_usage(
-                TimePeriod={
-                    'Start': month_start.strftime('%Y-%m-%d'),
-                    'End': month_end.strftime('%Y-%m-%d')
-                },
+            daily_response = self._get_cost_and_usage(
+                TimePeriod=time_period,
                 Granularity='DAILY',
                 Metrics=['BlendedCost', 'UsageQuantity'],
-                Filter={
-                    'And': [
-                        {
-                            'Dimensions': {
-                                'Key': 'SERVICE',
-                                'Values': [service_name]
-                            }
-                        },
-                        {
-                            'Dimensions': {
-                                'Key': 'USAGE_TYPE',
-                                'Values': [usage_type]
-                            }
-                        }
-                    ]
-                }
+                Filter=usage_type_filter
             )
             
             # Process daily costs
             daily_costs = []
             for result in daily_response['ResultsByTime']:
                 date = result['TimePeriod']['Start']
-                cost = float(result['Total']['BlendedCost']['Amount'])
-                usage = float(result['Total']['UsageQuantity']['Amount'])
+                cost = float(_get_amount(_get_blended(result['Total'])))
+                usage = float(_get_amount(_get_usage(result['Total'])))
                 
                 daily_costs.append({
                     'date': date,
                     'cost': cost,
                     'usage': usage,
-                    'cost_formatted': f"${cost:,.2f}",
-                    'usage_formatted': f"{usage:,.2f}"
+                    'cost_formatted': _format_usd(cost),
+                    'usage_formatted': _format_quantity(usage)
                 })
             
             breakdown['daily_breakdown'] = daily_costs
             
-            # Analyze cost trends
+            # Analyze cost trends on one array of the daily costs
+            daily_cost_values = np.fromiter((d['cost'] for d in daily_costs), dtype=np.float64, count=len(daily_costs))
             if daily_costs:
-                costs_only = [d['cost'] for d in daily_costs]
                 breakdown['cost_trends'] = {
-                    'avg_daily_cost': sum(costs_only) / len(costs_only),
-                    'max_daily_cost': max(costs_only),
-                    'min_daily_cost': min(costs_only),
-                    'total_cost': sum(costs_only),
-                    'cost_variance': np.var(costs_only) if len(costs_only) > 1 else 0,
-                    'trend_direction': 'increasing' if costs_only[-1] > costs_only[0] else 'decreasing'
+                    'avg_daily_cost': float(daily_cost_values.mean()),
+                    'max_daily_cost': float(daily_cost_values.max()),
+                    'min_daily_cost': float(daily_cost_values.min()),
+                    'total_cost': float(daily_cost_values.sum()),
+                    'cost_variance': float(daily_cost_values.var()) if len(daily_cost_values) > 1 else 0,
+                    'trend_direction': 'increasing' if daily_cost_values[-1] > daily_cost_values[0] else 'decreasing'
                 }
             
+            # The utilization score depends only on the daily cost pattern, so it is the same for every resource
+            utilization_score = self._calculate_utilization_score(daily_cost_values)
+            
             # Match actual resources with cost data using multiple dimensions
             resource_cost_mapping = []
+            # EC2 cost per instance type, requested once and shared by every instance
+            instance_type_costs = None
             
             if actual_resources:
                 for resource in actual_resources:
@@ -969,46 +1783,32 @@ class AWSCostService:
                     # For EC2, try to get instance-specific costs
                     elif 'EC2' in service_name and resource.get('instance_type'):
                         try:
-                            instance_cost_response = self.cost_explorer.get_cost_and_usage(
-                                TimePeriod={
-                                    'Start': month_start.strftime('%Y-%m-%d'),
-                                    'End': month_end.strftime('%Y-%m-%d')
-                                },
-                                Granularity='MONTHLY',
-                                Metrics=['BlendedCost'],
-                                GroupBy=[
-                                    {
-                                        'Type': 'DIMENSION',
-                                        'Key': 'INSTANCE_TYPE'
-                                    }
-                                ],
-                                Filter={
-                                    'And': [
-                                        {
-                                            'Dimensions': {
-                                                'Key': 'SERVICE',
-                                                'Values': [service_name]
-                                            }
-                                        },
+                            if instance_type_costs is None:
+                                instance_cost_response = self._get_cost_and_usage(
+                                    TimePeriod=time_period,
+                                    Granularity='MONTHLY',
+                                    Metrics=['BlendedCost'],
+                                    GroupBy=[
                                         {
-                                            'Dimensions': {
-                                                'Key': 'USAGE_TYPE',
-                                                'Values': [usage_type]
-                                            }
+                                            'Type': 'DIMENSION',
+                                            'Key': 'INSTANCE_TYPE'
                                         }
-                                    ]
+                                    ],
+                                    Filter=usage_type_filter
+                                )
+                                # A MONTHLY request for a single month returns exactly one period
+                                instance_type_costs = {
+                                    group['Keys'][0]: float(_get_amount(_get_blended(group['Metrics'])))
+                                    for group in (instance_cost_response['ResultsByTime'][0]['Groups'] if instance_cost_response['ResultsByTime'] else [])
                                 }
-                            )
                             
                             # Find matching instance type
-                            for result in instance_cost_response['ResultsByTime']:
-                                for group in result['Groups']:
-                                    if group['Keys'][0] == resource.get('instance_type'):
-                                        estimated_cost = float(group['Metrics']['BlendedCost']['Amount'])
-                                        cost_confidence = 'High'
-                                        break
+                            instance_type_cost = instance_type_costs.get(resource['instance_type'])
+                            if instance_type_cost is not None:
+                                estimated_cost = instance_type_cost
+                                cost_confidence = 'High'
                         except Exception as e:
-                            logger.debug(f"Could not get instance-specific cost: {str(e)}")
+                            logger.debug("Could not get instance-specific cost: %s", e)
                     
                     # Calculate cost per day for this resource
                     daily_cost = estimated_cost / len(daily_costs) if daily_costs else 0
@@ -1019,15 +1819,16 @@ class AWSCostService:
                         'estimated_monthly_cost': estimated_cost,
                         'estimated_daily_cost': daily_cost,
                         'cost_confidence': cost_confidence,
-                        'cost_formatted': f"${estimated_cost:,.2f}",
-                        'daily_cost_formatted': f"${daily_cost:,.2f}",
+                        'cost_formatted': _format_usd(estimated_cost),
+                        'daily_cost_formatted': _format_usd(daily_cost),
                         'resource_details': resource,
-                        'utilization_score': self._calculate_utilization_score(resource, daily_costs),
+                        'utilization_score': utilization_score,
                         'optimization_potential': self._identify_optimization_opportunities(resource, estimated_cost, daily_costs)
                     })
             
-            # Sort by estimated cost
-            resource_cost_mapping.sort(key=lambda x: x['estimated_monthly_cost'], reverse=True)
+            # Sort by estimated cost (descending), ranking the extracted costs in one argsort
+            estimated_costs = np.fromiter((r['estimated_monthly_cost'] for r in resource_cost_mapping), dtype=np.float64, count=len(resource_cost_mapping))
+            resource_cost_mapping = [resource_cost_mapping[i] for i in np.argsort(-estimated_costs, kind='stable')]
             breakdown['resource_costs'] = resource_cost_mapping
             
             # Generate optimization recommendations
@@ -1035,11 +1836,11 @@ class AWSCostService:
                 resource_cost_mapping, breakdown['cost_trends']
             )
             
-            logger.info(f"Generated cost breakdown for {len(resource_cost_mapping)} resources")
+            logger.info("Generated cost breakdown for %s resources", len(resource_cost_mapping))
             return breakdown
             
         except Exception as e:
-            logger.error(f"Error generating resource-level cost breakdown: {str(e)}")
+            logger.error("Error generating resource-level cost breakdown: %s", e)
             return {
                 'service_name': service_name,
                 'usage_type': usage_type,
@@ -1051,20 +1852,17 @@ class AWSCostService:
                 'error': str(e)
             }
 
-    def _calculate_utilization_score(self, resource: Dict[str, Any], daily_costs: List[Dict[str, Any]]) -> float:
+    def _calculate_utilization_score(self, daily_cost_values: np.ndarray) -> float:
         """Calculate utilization score for a resource based on cost patterns"""
         try:
-            if not daily_costs:
-                return 0.0
-            
             # Simple utilization based on cost consistency
-            costs = [d['cost'] for d in daily_costs if d['cost'] > 0]
-            if not costs:
+            costs = daily_cost_values[daily_cost_values > 0]
+            if not costs.size:
                 return 0.0
             
             # Higher variance = lower utilization score
-            avg_cost = sum(costs) / len(costs)
-            variance = sum((c - avg_cost) ** 2 for c in costs) / len(costs)
+            avg_cost = float(costs.mean())
+            variance = float(costs.var())
             utilization = max(0, 100 - (variance / avg_cost * 100)) if avg_cost > 0 else 0
             
             return min(100, max(0, utilization))
@@ -1104,7 +1902,7 @@ class AWSCostService:
                 opportunities.append("Optimize memory allocation and timeout settings")
             
         except Exception as e:
-            logger.debug(f"Error identifying optimization opportunities: {str(e)}")
+            logger.debug("Error identifying optimization opportunities: %s", e)
         
         return opportunities[:3]  # Return top 3 opportunities
 
@@ -1126,7 +1924,7 @@ class AWSCostService:
                     'type': 'High Cost Resources',
                     'description': f"Found {len(high_cost_resources)} resources consuming >20% of total cost",
                     'action': 'Review and optimize these high-impact resources first',
-                    'potential_savings': sum([r['estimated_monthly_cost'] * 0.1 for r in high_cost_resources]),
+                    'potential_savings': sum(r['estimated_monthly_cost'] * 0.1 for r in high_cost_resources),
                     'resources': [r['resource_name'] for r in high_cost_resources[:5]]
                 })
             
@@ -1137,7 +1935,7 @@ class AWSCostService:
                     'type': 'Low Utilization',
                     'description': f"Found {len(low_util_resources)} underutilized resources",
                     'action': 'Consider rightsizing, scheduling, or terminating unused resources',
-                    'potential_savings': sum([r['estimated_monthly_cost'] * 0.3 for r in low_util_resources]),
+                    'potential_savings': sum(r['estimated_monthly_cost'] * 0.3 for r in low_util_resources),
                     'resources': [r['resource_name'] for r in low_util_resources[:5]]
                 })
             
@@ -1152,7 +1950,7 @@ class AWSCostService:
                 })
             
         except Exception as e:
-            logger.debug(f"Error generating optimization recommendations: {str(e)}")
+            logger.debug("Error generating optimization recommendations: %s", e)
         
         return recommendations
 
@@ -1177,7 +1975,7 @@ class AWSCostService:
                 'pending_verification': verification_status == 'Pending'
             }
         except Exception as e:
-            logger.warning(f"Could not check SES verification status for {email}: {str(e)}")
+            logger.warning("Could not check SES verification status for %s: %s", email, e)
             return {
                 'email': email,
                 'verified': False,
@@ -1197,7 +1995,7 @@ class AWSCostService:
                 'email': email
             }
         except Exception as e:
-            logger.error(f"Failed to send verification email to {email}: {str(e)}")
+            logger.error("Failed to send verification email to %s: %s", email, e)
             return {
                 'success': False,
                 'message': f'Failed to send verification email: {str(e)}',
@@ -1239,7 +2037,7 @@ class AWSCostService:
             return budget_status
             
         except Exception as e:
-            logger.error(f"Error checking budget threshold: {str(e)}")
+            logger.error("Error checking budget threshold: %s", e)
             return {
                 'error': str(e),
                 'budget_amount': budget_amount,
@@ -1288,7 +2086,7 @@ class AWSCostService:
                 }
             )
             
-            logger.info(f"Budget notification sent to {email} - Alert Level: {alert_level}")
+            logger.info("Budget notification sent to %s - Alert Level: %s", email, alert_level)
             
             return {
                 'sent': True,
@@ -1299,7 +2097,7 @@ class AWSCostService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to send budget notification: {str(e)}")
+            logger.error("Failed to send budget notification: %s", e)
             return {
                 'sent': False,
                 'error': str(e),
@@ -1409,7 +2207,7 @@ This is an automated notification from AWS Cost Calculator & FinOps Tool.
             start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
             
             # Get costs for current month
-            response = self.cost_explorer.get_cost_and_usage(
+            response = self._get_cost_and_usage(
                 TimePeriod={
                     'Start': start_of_month.strftime('%Y-%m-%d'),
                     'End': now.strftime('%Y-%m-%d')
@@ -1418,15 +2216,10 @@ This is an automated notification from AWS Cost Calculator & FinOps Tool.
                 Metrics=['BlendedCost']
             )
             
-            total_cost = 0
-            for result in response['ResultsByTime']:
-                cost = float(result['Total']['BlendedCost']['Amount'])
-                total_cost += cost
-            
-            return total_cost
+            return sum((float(_get_amount(_get_blended(result['Total']))) for result in response['ResultsByTime']), 0.0)
             
         except Exception as e:
-            logger.error(f"Error getting current month cost: {str(e)}")
+            logger.error("Error getting current month cost: %s", e)
             return 0.0
     
     def get_enhanced_usage_type_details(self, service_name: str, usage_type: str, month: str, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
@@ -1444,7 +2237,47 @@ This is an automated notification from AWS Cost Calculator & FinOps Tool.
             Dictionary containing enhanced usage type breakdown with resource details
         """
         try:
-            logger.info(f"Fetching enhanced breakdown for {service_name} - {usage_type} in {month}")
+            logger.info("Fetching enhanced breakdown for %s - %s in %s", service_name, usage_type, month)
+            
+            # Parse month to get specific date range
+            month_start, month_end = _month_bounds(month)
+            time_period = {'Start': month_start.strftime('%Y-%m-%d'), 'End': month_end.strftime('%Y-%m-%d')}
+            usage_type_filter = _usage_type_filter(service_name, usage_type)
+            
+            # Start the independent dimension and linked account requests first so they run while the
+            # basic details and resource names are fetched. Detail dimensions the service only reports
+            # as a placeholder are skipped.
+            service_dimensions = _detail_dimensions(service_name)
+            dimensions_to_try = [
+                (dimension_key, dimension_name)
+                for dimension_key, dimension_name in [
+                    ('INSTANCE_TYPE', 'Instance Type'),
+                    ('AZ', 'Availability Zone'),
+                    ('PLATFORM', 'Platform'),
+                    ('OPERATION', 'Operation'),
+                    ('REGION', 'Region')
+                ]
+                if dimension_key not in _DETAIL_DIMENSIONS or dimension_key in service_dimensions
+            ]
+            # Cost Explorer accepts two GroupBy keys per request, so the dimensions (and LINKED_ACCOUNT)
+            # are requested in pairs and each pair's response is summed per key
+            dimension_names = dict(dimensions_to_try, LINKED_ACCOUNT='Account')
+            dimension_keys = list(dimension_names)
+            # Parameters shared by every dimension request; only GroupBy differs
+            dimension_request = {
+                'TimePeriod': time_period,
+                'Granularity': 'MONTHLY',
+                'Metrics': ['BlendedCost', 'UsageQuantity'],
+                'Filter': usage_type_filter
+            }
+            pair_futures = [
+                (pair_keys, _EXECUTOR.submit(
+                    self._get_cost_and_usage,
+                    GroupBy=[{'Type': 'DIMENSION', 'Key': key} for key in pair_keys],
+                    **dimension_request
+                ))
+                for pair_keys in (dimension_keys[i:i + 2] for i in range(0, len(dimension_keys), 2))
+            ]
             
             # Get the basic usage type details first
             basic_details = self.get_usage_type_details(service_name, usage_type, month, start_date, end_date)
@@ -1452,160 +2285,74 @@ This is an automated notification from AWS Cost Calculator & FinOps Tool.
             # Get actual resource names for this service
             actual_resources = self.get_actual_resource_names(service_name, usage_type, month)
             
-            # Parse month to get specific date range
-            month_start = datetime.strptime(month, '%Y-%m')
-            if month_start.month == 12:
-                month_end = month_start.replace(year=month_start.year + 1, month=1, day=1)
-            else:
-                month_end = month_start.replace(month=month_start.month + 1, day=1)
-            
             # Get enhanced resource breakdown using valid dimensions
-            enhanced_resources = []
-            
-            # Try multiple valid dimensions to get resource-level insights
-            dimensions_to_try = [
-                ('INSTANCE_TYPE', 'Instance Type'),
-                ('AZ', 'Availability Zone'), 
-                ('PLATFORM', 'Platform'),
-                ('OPERATION', 'Operation'),
-                ('REGION', 'Region')
-            ]
-            
-            for dimension_key, dimension_name in dimensions_to_try:
+            dimension_totals = {}
+            for pair_keys, pair_future in pair_futures:
                 try:
-                    resource_response = self.cost_explorer.get_cost_and_usage(
-                        TimePeriod={
-                            'Start': month_start.strftime('%Y-%m-%d'),
-                            'End': month_end.strftime('%Y-%m-%d')
-                        },
-                        Granularity='MONTHLY',
-                        Metrics=['BlendedCost', 'UsageQuantity'],
-                        GroupBy=[
-                            {
-                                'Type': 'DIMENSION',
-                                'Key': dimension_key
-                            }
-                        ],
-                        Filter={
-                            'And': [
-                                {
-                                    'Dimensions': {
-                                        'Key': 'SERVICE',
-                                        'Values': [service_name]
-                                    }
-                                },
-                                {
-                                    'Dimensions': {
-                                        'Key': 'USAGE_TYPE',
-                                        'Values': [usage_type]
-                                    }
-                                }
-                            ]
-                        }
-                    )
-                    
-                    for result in resource_response['ResultsByTime']:
-                        for group in result['Groups']:
-                            resource_value = group['Keys'][0] if group['Keys'] else f'Unknown {dimension_name}'
-                            cost = float(group['Metrics']['BlendedCost']['Amount'])
-                            usage = float(group['Metrics']['UsageQuantity']['Amount'])
-                            
-                            if cost > 0 and resource_value not in [f'No{dimension_key}', '']:
-                                # Create a descriptive resource entry
-                                enhanced_resources.append({
-                                    'Resource_ID': f"{dimension_name}: {resource_value}",
-                                    'Resource_Name': resource_value,
-                                    'Resource_Type': dimension_name,
-                                    'Resource_State': 'Active',
-                                    'Region': resource_value if dimension_name == 'Region' else 'Multiple',
-                                    'Cost': f"${cost:,.2f}",
-                                    'Usage_Quantity': f"{usage:,.2f}",
-                                    'Cost_Numeric': cost,
-                                    'Usage_Numeric': usage,
-                                    'Tags': {},
-                                    'Owner': 'Unknown',
-                                    'Environment': 'Unknown',
-                                    'Project': 'Unknown',
-                                    'Category': dimension_name
-                                })
-                    
+                    key_frames = [(pair_keys, _groups_frame(pair_future.result(), pair_keys, service_name))]
                 except Exception as e:
-                    logger.debug(f"Could not fetch {dimension_name} data: {str(e)}")
+                    if len(pair_keys) == 1:
+                        logger.warning("Could not fetch %s data: %s", dimension_names[pair_keys[0]], e)
+                        continue
+                    # A failed pair is re-requested one dimension at a time, so one unavailable
+                    # dimension does not hide the other
+                    logger.warning("Could not fetch %s data, retrying each dimension alone: %s",
+                                   ' + '.join(dimension_names[key] for key in pair_keys), e)
+                    retry_futures = [
+                        ([key], _EXECUTOR.submit(self._get_cost_and_usage, GroupBy=[{'Type': 'DIMENSION', 'Key': key}], **dimension_request))
+                        for key in pair_keys
+                    ]
+                    key_frames = []
+                    for retry_keys, retry_future in retry_futures:
+                        try:
+                            key_frames.append((retry_keys, _groups_frame(retry_future.result(), retry_keys, service_name)))
+                        except Exception as retry_error:
+                            logger.warning("Could not fetch %s data: %s", dimension_names[retry_keys[0]], retry_error)
+                
+                for frame_keys, frame_df in key_frames:
+                    for dimension_key in frame_keys:
+                        dimension_totals[dimension_key] = frame_df.groupby(dimension_key, sort=False)[['Cost_Numeric', 'Usage_Numeric']].sum()
+            
+            # Create a descriptive resource entry per attribute value, in dimension order, accounts last.
+            # Entries are deduplicated on resource name and cost as they are built, keeping the first one seen.
+            unique_resources = {}
+            for dimension_key, dimension_name in dimension_names.items():
+                if dimension_key not in dimension_totals:
                     continue
-            
-            # Try to get actual resource information using linked account dimension
-            try:
-                account_response = self.cost_explorer.get_cost_and_usage(
-                    TimePeriod={
-                        'Start': month_start.strftime('%Y-%m-%d'),
-                        'End': month_end.strftime('%Y-%m-%d')
-                    },
-                    Granularity='MONTHLY',
-                    Metrics=['BlendedCost', 'UsageQuantity'],
-                    GroupBy=[
-                        {
-                            'Type': 'DIMENSION',
-                            'Key': 'LINKED_ACCOUNT'
-                        }
-                    ],
-                    Filter={
-                        'And': [
-                            {
-                                'Dimensions': {
-                                    'Key': 'SERVICE',
-                                    'Values': [service_name]
-                                }
-                            },
-                            {
-                                'Dimensions': {
-                                    'Key': 'USAGE_TYPE',
-                                    'Values': [usage_type]
-                                }
-                            }
-                        ]
-                    }
-                )
                 
-                for result in account_response['ResultsByTime']:
-                    for group in result['Groups']:
-                        account_id = group['Keys'][0] if group['Keys'] else 'Unknown Account'
-                        cost = float(group['Metrics']['BlendedCost']['Amount'])
-                        usage = float(group['Metrics']['UsageQuantity']['Amount'])
-                        
-                        if cost > 0:
-                            enhanced_resources.append({
-                                'Resource_ID': f"Account: {account_id}",
-                                'Resource_Name': f"AWS Account {account_id}",
-                                'Resource_Type': 'AWS Account',
-                                'Resource_State': 'Active',
-                                'Region': 'Multiple',
-                                'Cost': f"${cost:,.2f}",
-                                'Usage_Quantity': f"{usage:,.2f}",
-                                'Cost_Numeric': cost,
-                                'Usage_Numeric': usage,
-                                'Tags': {},
-                                'Owner': 'Unknown',
-                                'Environment': 'Unknown',
-                                'Project': 'Unknown',
-                                'Category': 'Account'
-                            })
-                            
-            except Exception as e:
-                logger.debug(f"Could not fetch linked account data: {str(e)}")
-            
-            # Sort by cost (descending) and remove duplicates
-            enhanced_resources.sort(key=lambda x: x['Cost_Numeric'], reverse=True)
+                for resource_value, cost, usage in dimension_totals[dimension_key].itertuples():
+                    if cost <= 0 or resource_value in (_DIMENSION_PLACEHOLDERS[dimension_key], ''):
+                        continue
+                    
+                    if dimension_key == 'LINKED_ACCOUNT':
+                        resource_id, resource_name, resource_type = f"Account: {resource_value}", f"AWS Account {resource_value}", 'AWS Account'
+                    else:
+                        resource_id, resource_name, resource_type = f"{dimension_name}: {resource_value}", resource_value, dimension_name
+                    resource_key = (resource_name, float(cost))
+                    if resource_key in unique_resources:
+                        continue
+                    unique_resources[resource_key] = _EnhancedResource(
+                        resource_id,
+                        resource_name,
+                        resource_type,
+                        resource_value if dimension_name == 'Region' else 'Multiple',
+                        resource_key[1],
+                        float(usage),
+                        dimension_name
+                    )
             
-            # Remove duplicate entries based on resource name and cost
-            seen = set()
-            unique_resources = []
-            for resource in enhanced_resources:
-                key = (resource['Resource_Name'], resource['Cost_Numeric'])
-                if key not in seen:
-                    seen.add(key)
-                    unique_resources.append(resource)
+            # Top 50 unique resources by cost (descending), expanded into dicts with their display strings
+            basic_details['enhanced_resources'] = [
+                {
+                    **_ENHANCED_RESOURCE_DEFAULTS,
+                    **resource._asdict(),
+                    'Cost': _format_usd(resource.Cost_Numeric),
+                    'Usage_Quantity': _format_quantity(resource.Usage_Numeric),
+                    'Tags': {}
+                }
+                for resource in heapq.nlargest(50, unique_resources.values(), key=operator.attrgetter('Cost_Numeric'))
+            ]
             
-            basic_details['enhanced_resources'] = unique_resources[:50]  # Top 50 unique resources
             basic_details['actual_resources'] = actual_resources  # Add actual resource names
             
             # Get detailed resource-level cost breakdown
@@ -1614,12 +2361,12 @@ This is an automated notification from AWS Cost Calculator & FinOps Tool.
             )
             basic_details['resource_cost_breakdown'] = resource_cost_breakdown
             
-            if not enhanced_resources:
-                logger.warning(f"Could not fetch enhanced resource data using available dimensions")
+            if not unique_resources:
+                logger.warning("Could not fetch enhanced resource data using available dimensions")
             
             # Add cost attribution analysis
             if basic_details['enhanced_resources']:
-                total_identified_cost = sum([r['Cost_Numeric'] for r in basic_details['enhanced_resources']])
+                total_identified_cost = float(np.fromiter((r['Cost_Numeric'] for r in basic_details['enhanced_resources']), dtype=np.float64).sum())
                 basic_details['cost_attribution'] = {
                     'total_cost': basic_details['total_cost'],
                     'identified_cost': total_identified_cost,
@@ -1627,36 +2374,24 @@ This is an automated notification from AWS Cost Calculator & FinOps Tool.
                     'attribution_percentage': (total_identified_cost / basic_details['total_cost']) * 100 if basic_details['total_cost'] > 0 else 0
                 }
                 
-                # Group by common attributes
-                by_owner = {}
-                by_environment = {}
-                by_project = {}
-                
+                # Group by common attributes in a single pass; most_common() yields each ranked by cost (descending)
+                by_owner, by_environment, by_project = Counter(), Counter(), Counter()
                 for resource in basic_details['enhanced_resources']:
-                    owner = resource['Owner']
-                    env = resource['Environment']
-                    project = resource['Project']
                     cost = resource['Cost_Numeric']
-                    
-                    by_owner[owner] = by_owner.get(owner, 0) + cost
-                    by_environment[env] = by_environment.get(env, 0) + cost
-                    by_project[project] = by_project.get(project, 0) + cost
+                    by_owner[resource['Owner']] += cost
+                    by_environment[resource['Environment']] += cost
+                    by_project[resource['Project']] += cost
                 
-                basic_details['cost_by_owner'] = sorted(
-                    [{'Owner': k, 'Cost': v, 'Cost_Formatted': f"${v:,.2f}"} for k, v in by_owner.items()],
-                    key=lambda x: x['Cost'], reverse=True
-                )
-                basic_details['cost_by_environment'] = sorted(
-                    [{'Environment': k, 'Cost': v, 'Cost_Formatted': f"${v:,.2f}"} for k, v in by_environment.items()],
-                    key=lambda x: x['Cost'], reverse=True
-                )
-                basic_details['cost_by_project'] = sorted(
-                    [{'Project': k, 'Cost': v, 'Cost_Formatted': f"${v:,.2f}"} for k, v in by_project.items()],
-                    key=lambda x: x['Cost'], reverse=True
-                )
+                basic_details['cost_by_owner'] = [{'Owner': k, 'Cost': v, 'Cost_Formatted': _format_usd(v)} for k, v in by_owner.most_common()]
+                basic_details['cost_by_environment'] = [{'Environment': k, 'Cost': v, 'Cost_Formatted': _format_usd(v)} for k, v in by_environment.most_common()]
+                basic_details['cost_by_project'] = [{'Project': k, 'Cost': v, 'Cost_Formatted': _format_usd(v)} for k, v in by_project.most_common()]
             
             return basic_details
             
         except Exception as e:
-            logger.error(f"Error fetching enhanced usage type details: {str(e)}")
+            logger.error("Error fetching enhanced usage type details: %s", e)
             raise Exception(f"Failed to fetch enhanced usage type details: {str(e)}")
+    
+    async def get_enhanced_usage_type_details_async(self, service_name: str, usage_type: str, month: str, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+        """Async variant of get_enhanced_usage_type_details; takes the same arguments and returns the same result"""
+        return await _run_blocking(self.get_enhanced_usage_type_details, service_name, usage_type, month, start_date, end_date)
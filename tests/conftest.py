@@ -0,0 +1,81 @@
+import os
+import sys
+
+import pytest
+from botocore.stub import Stubber
+
+# aws_cost_service lives at the repository root rather than in an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aws_cost_service
+
+
+class FakeClock:
+    """Stand-in for time.time that only moves when a test advances it"""
+
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze the time seen by aws_cost_service, so TTL expiry can be stepped through"""
+    fake_clock = FakeClock()
+    monkeypatch.setattr(aws_cost_service.time, 'time', fake_clock)
+    return fake_clock
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    """Path of a fresh on-disk Cost Explorer cache"""
+    return str(tmp_path / 'ce_cache.sqlite3')
+
+
+@pytest.fixture
+def credentials(monkeypatch, cache_path):
+    """Point AWSCostService at test credentials and a fresh cache file; returns a setter for the access key"""
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'test-secret')
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    monkeypatch.setenv('AWS_COST_CACHE_PATH', cache_path)
+
+    def use_account(access_key_id: str) -> None:
+        monkeypatch.setenv('AWS_ACCESS_KEY_ID', access_key_id)
+
+    use_account('AKIDTESTACCOUNT1')
+    return use_account
+
+
+@pytest.fixture
+def service(credentials):
+    """AWSCostService for the default test account"""
+    return aws_cost_service.AWSCostService()
+
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    """
+    Install Stubber-backed boto3 clients as the shared clients of an AWSCostService
+
+    Returns a function taking (service, service_name) that returns the activated Stubber. Every
+    queued response must have been used by the end of the test.
+    """
+    stubbers = []
+
+    def install(service: aws_cost_service.AWSCostService, service_name: str, region_name: str = 'us-east-1') -> Stubber:
+        client = service._session.client(service_name, region_name=region_name)
+        monkeypatch.setitem(aws_cost_service._CLIENTS, (service._session, service_name, region_name), client)
+        stubber = Stubber(client)
+        stubber.activate()
+        stubbers.append(stubber)
+        return stubber
+
+    yield install
+    for stubber in stubbers:
+        stubber.assert_no_pending_responses()
+        stubber.deactivate()
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+
+from botocore.stub import ANY
+
+
+def _service_data(service_name: str, cost: float) -> dict:
+    return {
+        'service_name': service_name,
+        'total_cost': cost,
+        'usage_breakdown': [{'Month': 'January 2025', 'Usage_Type': f'{service_name}-usage', 'Cost_Numeric': cost}],
+        'resource_breakdown': [],
+        'resource_id_breakdown': [],
+        'monthly_data': {'January 2025': cost}
+    }
+
+
+def _converse_response(text: str) -> dict:
+    return {
+        'output': {'message': {'role': 'assistant', 'content': [{'text': text}]}},
+        'stopReason': 'end_turn',
+        'usage': {'inputTokens': 10, 'outputTokens': 10, 'totalTokens': 20},
+        'metrics': {'latencyMs': 1}
+    }
+
+
+def test_batched_answer_is_parsed_from_surrounding_text(service, stub_client):
+    stubber = stub_client(service, 'bedrock-runtime')
+    stubber.add_response('converse', _converse_response(
+        'Here are the recommendations:\n'
+        '{"recommendations": {"Amazon EC2": "Use Savings Plans", "AWS Lambda": "Tune memory {sizes}"}}\n'
+        'Let me know if you need more.'
+    ), {'modelId': ANY, 'system': ANY, 'messages': ANY, 'inferenceConfig': ANY})
+
+    recommendations = service.generate_ai_recommendations_batch(
+        [_service_data('Amazon EC2', 100.0), _service_data('AWS Lambda', 10.0)], [], total_aws_spend=200.0
+    )
+
+    assert recommendations == {'Amazon EC2': 'Use Savings Plans', 'AWS Lambda': 'Tune memory {sizes}'}
+
+
+def test_batched_answer_reports_missing_services_and_caches_the_rest(service, stub_client):
+    stubber = stub_client(service, 'bedrock-runtime')
+    stubber.add_response('converse', _converse_response('{"recommendations": {"Amazon EC2": "Use Savings Plans"}}'),
+                         {'modelId': ANY, 'system': ANY, 'messages': ANY, 'inferenceConfig': ANY})
+    services_data = [_service_data('Amazon EC2', 100.0), _service_data('AWS Lambda', 10.0)]
+
+    recommendations = service.generate_ai_recommendations_batch(services_data, [], total_aws_spend=200.0)
+
+    assert recommendations['Amazon EC2'] == 'Use Savings Plans'
+    assert 'did not include this service' in recommendations['AWS Lambda']
+
+    # Only the service without an answer is sent again; the other comes from the cache
+    stubber.add_response('converse', _converse_response('{"recommendations": {"AWS Lambda": "Tune memory"}}'),
+                         {'modelId': ANY, 'system': ANY, 'messages': ANY, 'inferenceConfig': ANY})
+
+    recommendations = service.generate_ai_recommendations_batch(services_data, [], total_aws_spend=200.0)
+
+    assert recommendations == {'Amazon EC2': 'Use Savings Plans', 'AWS Lambda': 'Tune memory'}
+
+
+def test_unparseable_batched_answer_is_reported_per_service(service, stub_client):
+    stubber = stub_client(service, 'bedrock-runtime')
+    stubber.add_response('converse', _converse_response('I cannot help with that.'),
+                         {'modelId': ANY, 'system': ANY, 'messages': ANY, 'inferenceConfig': ANY})
+
+    recommendations = service.generate_ai_recommendations_batch([_service_data('Amazon EC2', 100.0)], [], total_aws_spend=200.0)
+
+    assert recommendations['Amazon EC2'].startswith('Unable to generate AI recommendations at this time.')
+
+
+def test_cancelling_the_async_stream_mid_read_closes_the_stream(service, monkeypatch):
+    release_read = threading.Event()
+    stream_closed = threading.Event()
+
+    def stream_ai_recommendations(service_data, all_services_data, total_aws_spend=None):
+        try:
+            yield 'Use Savings Plans'
+            # The second fragment blocks in the executor until the test lets the read finish
+            release_read.wait(5)
+            yield ' and rightsize instances'
+        finally:
+            stream_closed.set()
+
+    monkeypatch.setattr(service, 'stream_ai_recommendations', stream_ai_recommendations)
+
+    async def consume(fragments):
+        async for fragment in service.stream_ai_recommendations_async(_service_data('Amazon EC2', 100.0), [], 200.0):
+            fragments.append(fragment)
+
+    async def cancel_mid_stream():
+        fragments = []
+        task = asyncio.create_task(consume(fragments))
+        while not fragments:
+            await asyncio.sleep(0.01)
+        # Let the second read reach the executor, then cancel while it is still blocked
+        await asyncio.sleep(0.05)
+        task.cancel()
+        asyncio.get_running_loop().call_later(0.05, release_read.set)
+        try:
+            await task
+        except asyncio.CancelledError:
+            return fragments, True
+        return fragments, False
+
+    fragments, cancelled = asyncio.run(cancel_mid_stream())
+
+    assert cancelled
+    assert fragments == ['Use Savings Plans']
+    assert stream_closed.is_set()
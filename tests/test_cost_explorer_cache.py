@@ -0,0 +1,108 @@
+from datetime import date, timedelta
+
+from aws_cost_service import _CostExplorerCache
+
+
+def _response(amount: str) -> dict:
+    return {'ResultsByTime': [{'TimePeriod': {'Start': '2025-01-01', 'End': '2025-02-01'}, 'Total': {'BlendedCost': {'Amount': amount}}}]}
+
+
+def test_get_returns_response_within_ttl(cache_path, clock):
+    cache = _CostExplorerCache(cache_path)
+    cache.put('key', _response('1.0'))
+
+    clock.advance(59)
+
+    assert cache.get('key', ttl=60) == _response('1.0')
+
+
+def test_get_expires_memory_and_disk_entries_after_ttl(cache_path, clock):
+    cache = _CostExplorerCache(cache_path)
+    cache.put('key', _response('1.0'))
+
+    clock.advance(61)
+
+    assert cache.get('key', ttl=60) is None
+    # A fresh instance only has the SQLite row to go on, which has expired as well
+    assert _CostExplorerCache(cache_path).get('key', ttl=60) is None
+
+
+def test_get_reads_disk_entries_into_memory(cache_path, clock):
+    _CostExplorerCache(cache_path).put('key', _response('1.0'))
+
+    cache = _CostExplorerCache(cache_path)
+    assert cache.get('key', ttl=60) == _response('1.0')
+
+    # Served from memory once read, keeping the original store time for TTL checks
+    cache.path = None
+    assert cache.get('key', ttl=60) == _response('1.0')
+    clock.advance(61)
+    assert cache.get('key', ttl=60) is None
+
+
+def test_memory_layer_evicts_least_recently_used_entry(cache_path, clock):
+    cache = _CostExplorerCache(cache_path)
+    cache.path = None
+    cache.MEMORY_MAX_ENTRIES = 2
+
+    cache.put('a', _response('1.0'))
+    cache.put('b', _response('2.0'))
+    # Reading 'a' makes 'b' the least recently used entry
+    assert cache.get('a', ttl=60) is not None
+    cache.put('c', _response('3.0'))
+
+    assert cache.get('b', ttl=60) is None
+    assert cache.get('a', ttl=60) == _response('1.0')
+    assert cache.get('c', ttl=60) == _response('3.0')
+
+
+def test_evicted_entries_are_still_read_from_disk(cache_path, clock):
+    cache = _CostExplorerCache(cache_path)
+    cache.MEMORY_MAX_ENTRIES = 1
+
+    cache.put('a', _response('1.0'))
+    cache.put('b', _response('2.0'))
+
+    assert 'a' not in cache._memory
+    assert cache.get('a', ttl=60) == _response('1.0')
+
+
+def test_ttl_for_uses_historical_ttl_only_for_closed_periods(cache_path):
+    cache = _CostExplorerCache(cache_path)
+    current_month_start = date.today().replace(day=1)
+
+    closed = {'TimePeriod': {'Start': '2020-01-01', 'End': current_month_start.isoformat()}}
+    open_period = {'TimePeriod': {'Start': '2020-01-01', 'End': (current_month_start + timedelta(days=1)).isoformat()}}
+
+    assert cache.ttl_for(closed) == _CostExplorerCache.HISTORICAL_TTL_SECONDS
+    assert cache.ttl_for(open_period) == _CostExplorerCache.CURRENT_TTL_SECONDS
+    assert cache.ttl_for({}) == _CostExplorerCache.CURRENT_TTL_SECONDS
+
+
+def test_ttl_for_uses_current_ttl_for_closed_periods_still_estimated(cache_path):
+    cache = _CostExplorerCache(cache_path)
+    previous_month_end = date.today().replace(day=1)
+    previous_month_start = (previous_month_end - timedelta(days=1)).replace(day=1)
+    params = {'TimePeriod': {'Start': previous_month_start.isoformat(), 'End': previous_month_end.isoformat()}}
+
+    estimated = _response('1.0')
+    estimated['ResultsByTime'][0]['Estimated'] = True
+    settled = _response('1.0')
+    settled['ResultsByTime'][0]['Estimated'] = False
+
+    assert cache.ttl_for(params, estimated) == _CostExplorerCache.CURRENT_TTL_SECONDS
+    assert cache.ttl_for(params, settled) == _CostExplorerCache.HISTORICAL_TTL_SECONDS
+
+
+def test_get_expires_estimated_closed_month_after_current_ttl(cache_path, clock):
+    cache = _CostExplorerCache(cache_path)
+    previous_month_end = date.today().replace(day=1)
+    params = {'TimePeriod': {'Start': (previous_month_end - timedelta(days=1)).replace(day=1).isoformat(), 'End': previous_month_end.isoformat()}}
+    estimated = _response('1.0')
+    estimated['ResultsByTime'][0]['Estimated'] = True
+    cache.put('key', estimated)
+
+    clock.advance(_CostExplorerCache.CURRENT_TTL_SECONDS + 1)
+
+    assert cache.get('key', lambda cached: cache.ttl_for(params, cached)) is None
+    assert _CostExplorerCache(cache_path).get('key', lambda cached: cache.ttl_for(params, cached)) is None
@@ -0,0 +1,278 @@
+import asyncio
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+import aws_cost_service
+from aws_cost_service import AWSCostService, _CostExplorerCache, _groups_frame
+
+
+def _period(start: str, end: str, groups=()) -> dict:
+    return {
+        'TimePeriod': {'Start': start, 'End': end},
+        'Total': {},
+        'Groups': [
+            {'Keys': [key], 'Metrics': {'BlendedCost': {'Amount': amount, 'Unit': 'USD'}}}
+            for key, amount in groups
+        ],
+        'Estimated': False
+    }
+
+
+def _service_request(start: str, end: str) -> dict:
+    return {
+        'TimePeriod': {'Start': start, 'End': end},
+        'Granularity': 'MONTHLY',
+        'Metrics': ['BlendedCost'],
+        'GroupBy': [{'Type': 'DIMENSION', 'Key': 'SERVICE'}]
+    }
+
+
+def _closed_request() -> dict:
+    return _service_request('2020-01-01', '2020-02-01')
+
+
+def _open_request() -> dict:
+    current_month_start = date.today().replace(day=1)
+    return _service_request(current_month_start.isoformat(), (current_month_start + timedelta(days=32)).replace(day=1).isoformat())
+
+
+def test_pages_are_merged_into_their_periods(service, stub_client):
+    stubber = stub_client(service, 'ce')
+    params = _service_request('2025-01-01', '2025-04-01')
+    stubber.add_response('get_cost_and_usage', {
+        'ResultsByTime': [
+            _period('2025-01-01', '2025-02-01', [('Amazon EC2', '10')]),
+            _period('2025-02-01', '2025-03-01', [('Amazon EC2', '11')])
+        ],
+        'NextPageToken': 'page-2'
+    }, params)
+    stubber.add_response('get_cost_and_usage', {
+        'ResultsByTime': [
+            _period('2025-02-01', '2025-03-01', [('AWS Lambda', '2')]),
+            _period('2025-03-01', '2025-04-01', [('Amazon EC2', '12')])
+        ]
+    }, dict(params, NextPageToken='page-2'))
+
+    response = service._get_cost_and_usage(**params)
+
+    assert 'NextPageToken' not in response
+    assert [
+        (result['TimePeriod']['Start'], [group['Keys'][0] for group in result['Groups']])
+        for result in response['ResultsByTime']
+    ] == [
+        ('2025-01-01', ['Amazon EC2']),
+        ('2025-02-01', ['Amazon EC2', 'AWS Lambda']),
+        ('2025-03-01', ['Amazon EC2'])
+    ]
+
+
+def test_responses_are_cached_per_account(credentials, stub_client):
+    first_account = AWSCostService()
+    first_stubber = stub_client(first_account, 'ce')
+    first_stubber.add_response('get_cost_and_usage', {'ResultsByTime': [_period('2020-01-01', '2020-02-01', [('Amazon EC2', '1')])]}, _closed_request())
+
+    first_account._get_cost_and_usage(**_closed_request())
+    # A second read for the same account is served from the cache, with no queued response
+    assert AWSCostService()._get_cost_and_usage(**_closed_request())['ResultsByTime'][0]['Groups'][0]['Keys'] == ['Amazon EC2']
+
+    credentials('AKIDTESTACCOUNT2')
+    second_account = AWSCostService()
+    second_stubber = stub_client(second_account, 'ce')
+    second_stubber.add_response('get_cost_and_usage', {'ResultsByTime': [_period('2020-01-01', '2020-02-01', [('AWS Lambda', '2')])]}, _closed_request())
+
+    # The same request for another account is not answered from the first account's entry
+    assert second_account._get_cost_and_usage(**_closed_request())['ResultsByTime'][0]['Groups'][0]['Keys'] == ['AWS Lambda']
+    assert second_account._cache_namespace != first_account._cache_namespace
+
+
+def test_closed_periods_outlive_the_current_period_ttl(service, stub_client, clock):
+    stubber = stub_client(service, 'ce')
+    for request in (_closed_request(), _open_request()):
+        stubber.add_response('get_cost_and_usage', {'ResultsByTime': [_period(request['TimePeriod']['Start'], request['TimePeriod']['End'])]}, request)
+        service._get_cost_and_usage(**request)
+
+    clock.advance(_CostExplorerCache.CURRENT_TTL_SECONDS + 1)
+
+    # Only the period that has not closed yet is requested again
+    open_request = _open_request()
+    stubber.add_response('get_cost_and_usage', {'ResultsByTime': [_period(open_request['TimePeriod']['Start'], open_request['TimePeriod']['End'])]}, open_request)
+    service._get_cost_and_usage(**_closed_request())
+    service._get_cost_and_usage(**open_request)
+
+
+def test_concurrent_callers_share_a_failed_fetch(service, monkeypatch):
+    fetch_started = threading.Event()
+    waiter_arrived = threading.Event()
+    release_fetch = threading.Event()
+    fetches = []
+
+    class SignallingFuture(aws_cost_service.Future):
+        def result(self, timeout=None):
+            waiter_arrived.set()
+            return super().result(timeout)
+
+    def failing_fetch(operation, **params):
+        fetches.append(params)
+        fetch_started.set()
+        release_fetch.wait(5)
+        raise RuntimeError('throttled')
+
+    monkeypatch.setattr(aws_cost_service, 'Future', SignallingFuture)
+    monkeypatch.setattr(service, '_get_all_cost_and_usage_pages', failing_fetch)
+
+    errors = {}
+
+    def call(name):
+        try:
+            service._get_cost_and_usage(**_closed_request())
+        except Exception as e:
+            errors[name] = e
+
+    first = threading.Thread(target=call, args=('first',))
+    first.start()
+    assert fetch_started.wait(5)
+    second = threading.Thread(target=call, args=('second',))
+    second.start()
+    assert waiter_arrived.wait(5)
+    release_fetch.set()
+    first.join(5)
+    second.join(5)
+
+    # One request served both callers, and both see its error
+    assert len(fetches) == 1
+    assert errors['first'] is errors['second']
+    assert str(errors['second']) == 'throttled'
+    assert aws_cost_service._IN_FLIGHT == {}
+
+    # The failure is neither cached nor left in flight, so the next call fetches again
+    monkeypatch.setattr(service, '_get_all_cost_and_usage_pages', lambda operation, **params: {'ResultsByTime': []})
+    assert service._get_cost_and_usage(**_closed_request()) == {'ResultsByTime': []}
+
+
+
+def test_fetch_finished_before_the_lock_is_served_from_the_cache(service, monkeypatch):
+    cache_get = service._cache.get
+    cached = {'ResultsByTime': [_period('2020-01-01', '2020-02-01', [('Amazon EC2', '1')])]}
+
+    def get_after_another_fetch(key, ttl):
+        # Another caller finishes its fetch and leaves _IN_FLIGHT between this miss and the lock
+        monkeypatch.setattr(service._cache, 'get', cache_get)
+        service._cache.put(key, cached)
+        return None
+
+    def unexpected_fetch(operation, **params):
+        raise AssertionError('fetched a response that was already cached')
+
+    monkeypatch.setattr(service._cache, 'get', get_after_another_fetch)
+    monkeypatch.setattr(service, '_get_all_cost_and_usage_pages', unexpected_fetch)
+
+    assert service._get_cost_and_usage(**_closed_request()) == cached
+    assert aws_cost_service._IN_FLIGHT == {}
+
+@pytest.mark.parametrize('days, resolution, records', [
+    (aws_cost_service.DAILY_RESOLUTION_MAX_DAYS, 'daily', aws_cost_service.DAILY_RESOLUTION_MAX_DAYS),
+    (aws_cost_service.DAILY_RESOLUTION_MAX_DAYS + 1, 'weekly', -(-(aws_cost_service.DAILY_RESOLUTION_MAX_DAYS + 1) // 7))
+])
+def test_auto_resolution_switches_to_weekly_past_the_daily_limit(service, stub_client, days, resolution, records):
+    start = date(2025, 1, 1)
+    end = start + timedelta(days=days)
+    stubber = stub_client(service, 'ce')
+    stubber.add_response('get_cost_and_usage', {
+        'ResultsByTime': [
+            {
+                'TimePeriod': {'Start': (start + timedelta(days=i)).isoformat(), 'End': (start + timedelta(days=i + 1)).isoformat()},
+                'Total': {'BlendedCost': {'Amount': '1', 'Unit': 'USD'}},
+                'Groups': [],
+                'Estimated': False
+            }
+            for i in range(days)
+        ]
+    }, {
+        'TimePeriod': {'Start': start.isoformat(), 'End': end.isoformat()},
+        'Granularity': 'DAILY',
+        'Metrics': ['BlendedCost']
+    })
+
+    costs = service.get_daily_costs(
+        aws_cost_service.datetime(2025, 1, 1), aws_cost_service.datetime.combine(end, aws_cost_service.datetime.min.time()), resolution='auto'
+    )
+
+    assert len(costs) == records
+    assert sum(cost['Amount_Numeric'] for cost in costs) == days
+    if resolution == 'weekly':
+        assert [cost['Date'] for cost in costs[:2]] == ['2025-01-01', '2025-01-08']
+
+
+def test_unknown_resolution_is_rejected_before_any_request(service, stub_client):
+    # The stubber has no queued response, so any request would fail the test
+    stub_client(service, 'ce')
+
+    with pytest.raises(ValueError, match="'hourly'"):
+        service.get_daily_costs(aws_cost_service.datetime(2025, 1, 1), aws_cost_service.datetime(2025, 2, 1), resolution='hourly')
+
+
+def _grouped_response(groups) -> dict:
+    return {'ResultsByTime': [{'TimePeriod': {'Start': '2025-01-01', 'End': '2025-02-01'}, 'Groups': [
+        {'Keys': keys, 'Metrics': metrics} for keys, metrics in groups
+    ]}]}
+
+
+def test_cost_only_frames_carry_no_usage_column():
+    response = _grouped_response([(['us-east-1a'], {'BlendedCost': {'Amount': '4.5', 'Unit': 'USD'}})])
+
+    records = _groups_frame(response, ['AZ'], 'Amazon Elastic Compute Cloud - Compute', include_usage=False).to_dict('records')
+
+    assert records == [{'Month': 'January 2025', 'AZ': 'us-east-1a', 'Cost_Numeric': 4.5, 'SERVICE': 'Amazon Elastic Compute Cloud - Compute'}]
+
+
+def test_only_the_usage_type_request_asks_for_usage_quantity(service, monkeypatch):
+    requests = {}
+
+    def get_cost_and_usage(operation='get_cost_and_usage', **params):
+        group_keys = tuple(group['Key'] for group in params['GroupBy'])
+        requests[group_keys] = params['Metrics']
+        if group_keys[0] == 'USAGE_TYPE':
+            return _grouped_response([(['BoxUsage:m5.large', 'm5.large'], {
+                'BlendedCost': {'Amount': '10', 'Unit': 'USD'},
+                'UsageQuantity': {'Amount': '720', 'Unit': 'Hrs'}
+            })])
+        return _grouped_response([(['us-east-1a', 'Linux/UNIX'], {'BlendedCost': {'Amount': '10', 'Unit': 'USD'}})])
+
+    monkeypatch.setattr(service, '_get_cost_and_usage', get_cost_and_usage)
+    monkeypatch.setattr(aws_cost_service, '_RESOURCE_DATA_UNAVAILABLE', {service._cache_namespace})
+
+    detailed = service.get_service_detailed_costs(
+        'Amazon Elastic Compute Cloud - Compute', aws_cost_service.datetime(2025, 1, 1), aws_cost_service.datetime(2025, 2, 1)
+    )
+
+    assert requests == {('USAGE_TYPE', 'INSTANCE_TYPE'): ['BlendedCost', 'UsageQuantity'], ('AZ', 'PLATFORM'): ['BlendedCost']}
+    assert detailed['usage_breakdown'] == [{'Month': 'January 2025', 'Usage_Type': 'BoxUsage:m5.large', 'Cost_Numeric': 10.0, 'Usage_Numeric': 720.0}]
+    assert sorted(record['Category'] for record in detailed['resource_breakdown']) == ['Availability Zone', 'Instance Type', 'Platform']
+    assert all('Usage_Numeric' not in record for record in detailed['resource_breakdown'])
+
+
+def test_async_service_detail_matches_the_stubbed_request(service, stub_client, monkeypatch):
+    monkeypatch.setattr(aws_cost_service, '_RESOURCE_DATA_UNAVAILABLE', {service._cache_namespace})
+    stubber = stub_client(service, 'ce')
+    # AWS Lambda reports no instance type, AZ or platform, so one USAGE_TYPE request covers the view
+    stubber.add_response('get_cost_and_usage', _grouped_response([(['Lambda-GB-Second'], {
+        'BlendedCost': {'Amount': '3.5', 'Unit': 'USD'},
+        'UsageQuantity': {'Amount': '1000', 'Unit': 'Lambda-GB-Second'}
+    })]), {
+        'TimePeriod': {'Start': '2025-01-01', 'End': '2025-02-01'},
+        'Granularity': 'MONTHLY',
+        'Metrics': ['BlendedCost', 'UsageQuantity'],
+        'GroupBy': [{'Type': 'DIMENSION', 'Key': 'USAGE_TYPE'}],
+        'Filter': {'Dimensions': {'Key': 'SERVICE', 'Values': ['AWS Lambda']}}
+    })
+
+    # A longer range is clipped to the requested months before the stubbed request is made
+    detailed = asyncio.run(service.get_service_detailed_costs_async(
+        'AWS Lambda', aws_cost_service.datetime(2024, 7, 1), aws_cost_service.datetime(2025, 2, 1), months=1
+    ))
+
+    assert detailed['total_cost'] == 3.5
+    assert detailed['monthly_data'] == {'January 2025': 3.5}
+    assert detailed['usage_breakdown'] == [{'Month': 'January 2025', 'Usage_Type': 'Lambda-GB-Second', 'Cost_Numeric': 3.5, 'Usage_Numeric': 1000.0}]
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+import pytest
+
+from aws_cost_service import _clip_range, _month_bounds, _month_label
+
+
+@pytest.mark.parametrize('end_date, max_months, expected', [
+    # A first-of-month end is exclusive, so the window is the max_months whole months before it
+    (datetime(2025, 3, 1), 6, datetime(2024, 9, 1)),
+    (datetime(2025, 1, 1), 1, datetime(2024, 12, 1)),
+    (datetime(2025, 1, 1), 12, datetime(2024, 1, 1)),
+    (datetime(2025, 1, 1), 13, datetime(2023, 12, 1)),
+    # A mid-month end already contributes a partial bucket for its own month
+    (datetime(2025, 1, 15), 1, datetime(2025, 1, 1)),
+    (datetime(2025, 1, 15), 2, datetime(2024, 12, 1)),
+    (datetime(2025, 2, 15), 6, datetime(2024, 9, 1)),
+])
+def test_clip_range_crosses_year_boundaries(end_date, max_months, expected):
+    assert _clip_range(datetime(2000, 1, 1), end_date, max_months) == expected
+
+
+def test_clip_range_keeps_a_later_start():
+    start_date = datetime(2024, 11, 20)
+    assert _clip_range(start_date, datetime(2025, 1, 1), 6) == start_date
+
+
+@pytest.mark.parametrize('month, expected', [
+    ('2024-11', (datetime(2024, 11, 1), datetime(2024, 12, 1))),
+    ('2024-12', (datetime(2024, 12, 1), datetime(2025, 1, 1))),
+    ('2025-01', (datetime(2025, 1, 1), datetime(2025, 2, 1))),
+])
+def test_month_bounds_roll_december_into_the_next_year(month, expected):
+    assert _month_bounds(month) == expected
+
+
+def test_month_label():
+    assert _month_label('2024-12-01') == 'December 2024'
@@ -3,6 +3,10 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any, Tuple
 import io
 
+# Bound formatters for dollar amounts and usage quantities, so each format spec is parsed once rather than per value
+_format_usd = "${:,.2f}".format
+_format_quantity = "{:,.2f}".format
+
 def format_currency(amount) -> str:
     """
     Format a numeric amount as currency string
@@ -17,7 +21,24 @@ def format_currency(amount) -> str:
     if isinstance(amount, str):
         return amount
     # If numeric, format it
-    return f"${amount:,.2f}"
+    return _format_usd(amount)
+
+def format_cost_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Format numeric cost and usage columns of a breakdown table for display
+    
+    Args:
+        df: DataFrame with Cost_Numeric and optionally Usage_Numeric columns
+        
+    Returns:
+        Copy of the DataFrame with formatted Cost and Usage_Quantity columns in their place
+    """
+    display_df = df.copy()
+    if 'Cost_Numeric' in display_df.columns:
+        display_df['Cost_Numeric'] = display_df['Cost_Numeric'].map(format_currency)
+    if 'Usage_Numeric' in display_df.columns:
+        display_df['Usage_Numeric'] = display_df['Usage_Numeric'].map(_format_quantity)
+    return display_df.rename(columns={'Cost_Numeric': 'Cost', 'Usage_Numeric': 'Usage_Quantity'})
 
 def get_date_range(months: int) -> Tuple[datetime, datetime]:
     """
@@ -89,9 +110,7 @@ def calculate_cost_trend(current_costs: List[Dict[str, Any]]) -> Dict[str, Any]:
     # Extract numeric values
     costs = []
     for cost_data in current_costs:
-        amount_str = cost_data.get('Amount', '$0.00')
-        amount = float(amount_str.replace('$', '').replace(',', ''))
-        costs.append(amount)
+        costs.append(cost_data.get('Amount_Numeric', 0.0))
     
     # Calculate statistics
     total_cost = sum(costs)
@@ -140,8 +159,7 @@ def filter_costs_by_threshold(service_costs: List[Dict[str, Any]], threshold: fl
     filtered_costs = []
     
     for service in service_costs:
-        amount_str = service.get('Amount', '$0.00')
-        amount = float(amount_str.replace('$', '').replace(',', ''))
+        amount = service.get('Amount_Numeric', 0.0)
         
         if amount >= threshold:
             filtered_costs.append(service)
@@ -171,9 +189,7 @@ def generate_cost_summary(monthly_costs: List[Dict[str, Any]], service_costs: Li
     # Calculate monthly statistics
     monthly_amounts = []
     for month_data in monthly_costs:
-        amount_str = month_data.get('Amount', '$0.00')
-        amount = float(amount_str.replace('$', '').replace(',', ''))
-        monthly_amounts.append(amount)
+        monthly_amounts.append(month_data.get('Amount_Numeric', 0.0))
     
     total_cost = sum(monthly_amounts)
     average_monthly = total_cost / len(monthly_amounts) if monthly_amounts else 0